@@ -4,106 +4,63 @@ HedgeLab Demo Script
 Demonstrates core functionality without the Streamlit interface
 """
 
-import os
 import sys
-import subprocess
-from pathlib import Path
-from datetime import datetime, timedelta
+import io
+from concurrent.futures import ThreadPoolExecutor
+from typing import TextIO
+from src.utils.setup_check import check_and_setup
 
-def check_and_setup():
-    """Check if setup is needed and run it if necessary"""
-    print("🔧 Checking HedgeLab setup...")
-    
-    # Check if we're in the right directory
-    if not Path("setup.py").exists():
-        print("❌ setup.py not found. Please run from HedgeLab directory.")
-        return False
-    
-    # Check if main dependencies are installed
-    try:
-        import streamlit
-        import pandas
-        import plotly
-        import yfinance
-        print("✅ All dependencies are installed")
-        return True
-    except ImportError as e:
-        print(f"❌ Missing dependency: {e}")
-        print("🔧 Running setup to install dependencies...")
-        
-        try:
-            result = subprocess.run([sys.executable, "setup.py"], 
-                                  capture_output=True, text=True, timeout=60)
-            if result.returncode == 0:
-                print("✅ Setup completed successfully")
-                return True
-            else:
-                print(f"❌ Setup failed: {result.stderr}")
-                return False
-        except subprocess.TimeoutExpired:
-            print("❌ Setup timed out")
-            return False
-        except Exception as e:
-            print(f"❌ Setup error: {e}")
-            return False
-
-# Add src to path for imports
-sys.path.append('src')
-
-def demo_market_data():
+def demo_market_data(out: TextIO = sys.stdout):
     """Demo market data functionality"""
-    print("🌍 MARKET DATA DEMO")
-    print("=" * 50)
+    lines = ["🌍 MARKET DATA DEMO", "=" * 50]
     
     try:
-        from data.market_data import market_data
+        from src.data.market_data import market_data
         
         # Get market indices
-        print("📊 Fetching market indices...")
+        lines.append("📊 Fetching market indices...")
         indices = market_data.get_market_indices()
         
         if indices:
             for name, data in indices.items():
                 change_symbol = "📈" if data['change'] >= 0 else "📉"
-                print(f"{change_symbol} {name}: ${data['value']:,.2f} ({data['change']:+.2f}%)")
+                lines.append(f"{change_symbol} {name}: ${data['value']:,.2f} ({data['change']:+.2f}%)")
         else:
-            print("⚠️ Could not fetch market data (API rate limit or network issue)")
-            print("💡 Please wait a few minutes before trying again")
+            lines.append("⚠️ Could not fetch market data (API rate limit or network issue)")
+            lines.append("💡 Please wait a few minutes before trying again")
         
-        print()
+        lines.append("")
         
         # Get stock data
-        print("📈 Fetching AAPL stock data...")
+        lines.append("📈 Fetching AAPL stock data...")
         stock_data = market_data.get_stock_data("AAPL", period="5d")
         
         if not stock_data.empty:
-            latest = stock_data.iloc[-1]
-            print(f"📊 AAPL Latest: ${latest['Close']:.2f}")
-            print(f"📅 Date: {latest['Date'].strftime('%Y-%m-%d')}")
-            print(f"📊 Volume: {latest['Volume']:,.0f}")
+            lines.append(f"📊 AAPL Latest: ${stock_data['Close'].iat[-1]:.2f}")
+            lines.append(f"📅 Date: {stock_data['Date'].iat[-1].strftime('%Y-%m-%d')}")
+            lines.append(f"📊 Volume: {stock_data['Volume'].iat[-1]:,.0f}")
         else:
-            print("⚠️ Could not fetch AAPL data (API rate limit or network issue)")
-            print("💡 Please wait a few minutes before trying again")
+            lines.append("⚠️ Could not fetch AAPL data (API rate limit or network issue)")
+            lines.append("💡 Please wait a few minutes before trying again")
             
     except Exception as e:
-        print(f"❌ Error in market data demo: {e}")
+        lines.append(f"❌ Error in market data demo: {e}")
     
-    print()
+    lines.append("")
+    out.write("\n".join(lines) + "\n")
 
-def demo_technical_analysis():
+def demo_technical_analysis(out: TextIO = sys.stdout):
     """Demo technical analysis functionality"""
-    print("🔍 TECHNICAL ANALYSIS DEMO")
-    print("=" * 50)
+    lines = ["🔍 TECHNICAL ANALYSIS DEMO", "=" * 50]
     
     try:
-        from opportunities.opportunity_detector import OpportunityDetector
+        from src.data.market_data import market_data
+        from src.opportunities.opportunity_detector import get_detector
         
-        detector = OpportunityDetector()
+        detector = get_detector()
         
         # Get stock data and calculate indicators
-        print("📊 Analyzing AAPL technical indicators...")
-        
-        from data.market_data import market_data
+        lines.append("📊 Analyzing AAPL technical indicators...")
         stock_data = market_data.get_stock_data("AAPL", period="3mo")
         
         if not stock_data.empty:
@@ -111,36 +68,36 @@ def demo_technical_analysis():
             technical_data = detector._calculate_technical_indicators(stock_data)
             
             if not technical_data.empty:
-                latest = technical_data.iloc[-1]
-                
-                print(f"📈 Current Price: ${latest['Close']:.2f}")
-                print(f"📊 RSI: {latest['RSI']:.2f}")
-                print(f"📊 20-day MA: ${latest['MA20']:.2f}")
-                print(f"📊 50-day MA: ${latest['MA50']:.2f}")
+                lines.append(f"📈 Current Price: ${technical_data['Close'].iat[-1]:.2f}")
+                lines.append(f"📊 RSI: {technical_data['RSI'].iat[-1]:.2f}")
+                lines.append(f"📊 20-day MA: ${technical_data['MA20'].iat[-1]:.2f}")
+                lines.append(f"📊 50-day MA: ${technical_data['MA50'].iat[-1]:.2f}")
                 
                 # Get signals
                 signals = detector._get_technical_signals(technical_data)
-                print("\n🎯 Technical Signals:")
+                lines.append("\n🎯 Technical Signals:")
                 for signal_name, signal_data in signals.items():
                     emoji = "🟢" if signal_data['signal'] == "BUY" else "🔴" if signal_data['signal'] == "SELL" else "🟡"
-                    print(f"{emoji} {signal_name}: {signal_data['signal']} (Strength: {signal_data['strength']:.2f})")
+                    lines.append(f"{emoji} {signal_name}: {signal_data['signal']} (Strength: {signal_data['strength']:.2f})")
             else:
-                print("⚠️ Could not calculate technical indicators (no data available)")
+                lines.append("⚠️ Could not calculate technical indicators (no data available)")
         else:
-            print("⚠️ Could not fetch stock data for analysis (API rate limit or network issue)")
-            print("💡 Please wait a few minutes before trying again")
+            lines.append("⚠️ Could not fetch stock data for analysis (API rate limit or network issue)")
+            lines.append("💡 Please wait a few minutes before trying again")
             
     except Exception as e:
-        print(f"❌ Error in technical analysis demo: {e}")
+        lines.append(f"❌ Error in technical analysis demo: {e}")
     
-    print()
+    lines.append("")
+    out.write("\n".join(lines) + "\n")
 
-def demo_portfolio_simulation():
+def demo_portfolio_simulation(out: TextIO = sys.stdout):
     """Demo portfolio functionality with simulated data"""
-    print("💼 PORTFOLIO SIMULATION DEMO")
-    print("=" * 50)
+    lines = ["💼 PORTFOLIO SIMULATION DEMO", "=" * 50]
     
     try:
+        import pandas as pd
+        
         # Simulate some trades
         trades = [
             {"symbol": "AAPL", "side": "BUY", "quantity": 100, "price": 150.00, "date": "2024-01-15"},
@@ -149,63 +106,67 @@ def demo_portfolio_simulation():
             {"symbol": "AAPL", "side": "SELL", "quantity": 50, "price": 155.00, "date": "2024-02-01"}
         ]
         
-        print("📝 Simulated Trade History:")
+        lines.append("📝 Simulated Trade History:")
         for trade in trades:
             total_value = trade['quantity'] * trade['price']
-            print(f"📈 {trade['date']}: {trade['side']} {trade['quantity']} {trade['symbol']} @ ${trade['price']:.2f} = ${total_value:,.2f}")
+            lines.append(f"📈 {trade['date']}: {trade['side']} {trade['quantity']} {trade['symbol']} @ ${trade['price']:.2f} = ${total_value:,.2f}")
         
-        print("\n💰 Simulated Current Positions:")
-        positions = {
+        lines.append("\n💰 Simulated Current Positions:")
+        positions = pd.DataFrame.from_dict({
             "AAPL": {"quantity": 50, "avg_cost": 150.00},
             "MSFT": {"quantity": 50, "avg_cost": 300.00},
             "GOOGL": {"quantity": 25, "avg_cost": 2800.00}
-        }
-        
-        total_value = 0
-        for symbol, position in positions.items():
-            market_value = position['quantity'] * position['avg_cost'] * 1.05  # Simulate 5% gain
-            total_value += market_value
-            pnl = market_value - (position['quantity'] * position['avg_cost'])
-            pnl_pct = (pnl / (position['quantity'] * position['avg_cost'])) * 100
-            
-            print(f"📊 {symbol}: {position['quantity']} shares @ ${position['avg_cost']:.2f} avg cost")
-            print(f"   💰 Market Value: ${market_value:,.2f} | P&L: ${pnl:,.2f} ({pnl_pct:+.1f}%)")
+        }, orient='index')
+        
+        positions['cost_basis'] = positions['quantity'] * positions['avg_cost']
+        positions['market_value'] = positions['cost_basis'] * 1.05  # Simulate 5% gain
+        positions['pnl'] = positions['market_value'] - positions['cost_basis']
+        positions['pnl_pct'] = positions['pnl'] / positions['cost_basis'] * 100
+        
+        for position in positions.itertuples():
+            lines.append(f"📊 {position.Index}: {position.quantity} shares @ ${position.avg_cost:.2f} avg cost")
+            lines.append(f"   💰 Market Value: ${position.market_value:,.2f} | P&L: ${position.pnl:,.2f} ({position.pnl_pct:+.1f}%)")
         
-        print(f"\n📈 Total Portfolio Value: ${total_value:,.2f}")
-        print(f"💰 Total P&L: ${total_value * 0.05:,.2f} (+5.0%)")
+        total_value, total_cost = positions[['market_value', 'cost_basis']].sum()
+        total_pnl = total_value - total_cost
+        lines.append(f"\n📈 Total Portfolio Value: ${total_value:,.2f}")
+        lines.append(f"💰 Total P&L: ${total_pnl:,.2f} ({total_pnl / total_cost * 100:+.1f}%)")
         
     except Exception as e:
-        print(f"❌ Error in portfolio demo: {e}")
+        lines.append(f"❌ Error in portfolio demo: {e}")
     
-    print()
+    lines.append("")
+    out.write("\n".join(lines) + "\n")
 
-def demo_database_connection():
+def demo_database_connection(out: TextIO = sys.stdout):
     """Demo database connection"""
-    print("🗄️ DATABASE CONNECTION DEMO")
-    print("=" * 50)
+    lines = ["🗄️ DATABASE CONNECTION DEMO", "=" * 50]
     
     try:
-        from data.database import db
+        from src.data.database import db
         
         if db.is_connected():
-            print("✅ Successfully connected to Supabase database")
+            lines.append("✅ Successfully connected to Supabase database")
         else:
-            print("ℹ️ Running in local storage mode (no database connection)")
-            print("💡 Add SUPABASE_URL and SUPABASE_KEY to .env for cloud database")
+            lines.append("ℹ️ Running in local storage mode (no database connection)")
+            lines.append("💡 Add SUPABASE_URL and SUPABASE_KEY to .env for cloud database")
         
     except Exception as e:
-        print(f"❌ Error testing database connection: {e}")
+        lines.append(f"❌ Error testing database connection: {e}")
     
-    print()
+    lines.append("")
+    out.write("\n".join(lines) + "\n")
 
 def main():
     """Run all demos"""
-    print("🚀 HEDGELAB FUNCTIONALITY DEMO")
-    print("=" * 70)
-    print("Welcome to HedgeLab - A Simple Investment Learning Tool")
-    print("This demo showcases the basic functionality without the web interface")
-    print("=" * 70)
-    print()
+    sys.stdout.write("\n".join([
+        "🚀 HEDGELAB FUNCTIONALITY DEMO",
+        "=" * 70,
+        "Welcome to HedgeLab - A Simple Investment Learning Tool",
+        "This demo showcases the basic functionality without the web interface",
+        "=" * 70,
+        "",
+    ]) + "\n")
     
     # Check and run setup if needed
     if not check_and_setup():
@@ -214,27 +175,43 @@ def main():
     
     print()
     
-    # Run demos
-    demo_market_data()
-    demo_technical_analysis()
-    demo_portfolio_simulation()
-    demo_database_connection()
+    # Fetch the data the demos need up front, in parallel with the indices
+    try:
+        from src.data.market_data import market_data
+        market_data.prefetch([("AAPL", "3mo")])
+        # Run after the 3mo fetch, not alongside it: with the disk cache on it is cut from the
+        # bars just stored, and with HEDGELAB_DISK_CACHE=0 it is fetched here, before the demos
+        market_data.get_stock_data("AAPL", period="5d")
+    except Exception as e:
+        print(f"⚠️ Could not prefetch market data: {e}")
     
-    print("🎉 DEMO COMPLETED!")
-    print("=" * 50)
-    print("✅ HedgeLab demo completed successfully!")
-    print("🌐 To start the web interface, run: python run.py")
-    print("📖 Or use: streamlit run main.py")
-    print("🔗 Then open: http://localhost:8501")
-    print()
-    print("📋 Basic Features Available:")
-    print("• 🌍 Market Overview - Simple market indices and news")
-    print("• 🔍 Stock Analysis - Basic technical indicators")
-    print("• 💼 Portfolio Tracking - Simple trade logging")
-    print("• 📊 Basic Reports - Simple PDF/Excel exports")
-    print()
-    print("💡 Tip: Uses free Yahoo Finance data - clear error messages when rate limited!")
-    print("🚨 Disclaimer: This is a learning project. Not financial advice.")
+    # Run demos - the network/IO bound sections run concurrently, each writing
+    # to its own buffer so the output is printed in order once they finish
+    sections = [demo_market_data, demo_technical_analysis, demo_portfolio_simulation, demo_database_connection]
+    buffers = [io.StringIO() for _ in sections]
+    with ThreadPoolExecutor(max_workers=len(sections)) as executor:
+        futures = [executor.submit(section, buffer) for section, buffer in zip(sections, buffers)]
+        for future, buffer in zip(futures, buffers):
+            future.result()
+            sys.stdout.write(buffer.getvalue())
+    
+    sys.stdout.write("\n".join([
+        "🎉 DEMO COMPLETED!",
+        "=" * 50,
+        "✅ HedgeLab demo completed successfully!",
+        "🌐 To start the web interface, run: python run.py",
+        "📖 Or use: streamlit run main.py",
+        "🔗 Then open: http://localhost:8501",
+        "",
+        "📋 Basic Features Available:",
+        "• 🌍 Market Overview - Simple market indices and news",
+        "• 🔍 Stock Analysis - Basic technical indicators",
+        "• 💼 Portfolio Tracking - Simple trade logging",
+        "• 📊 Basic Reports - Simple PDF/Excel exports",
+        "",
+        "💡 Tip: Uses free Yahoo Finance data - clear error messages when rate limited!",
+        "🚨 Disclaimer: This is a learning project. Not financial advice.",
+    ]) + "\n")
 
 if __name__ == "__main__":
     main() 
\ No newline at end of file
@@ -1,13 +1,12 @@
 import streamlit as st
-import os
-import sys
-from datetime import datetime
+import importlib
+import functools
+from pathlib import Path
 from dotenv import load_dotenv
 
-# Add src to path and import logger
-sys.path.append('src')
+# Import logger
 try:
-    from utils.logger import logger
+    from src.utils.logger import logger
 except ImportError:
     # Create a simple logger if the main one isn't available
     import logging
@@ -25,44 +24,27 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+@st.cache_data
+def _load_css() -> str:
+    """Read the app stylesheet once per process"""
+    return (Path(__file__).parent / "static" / "hedgelab.css").read_text()
+
 # Custom CSS for simple styling
-st.markdown("""
-<style>
-    .main-header {
-        background: linear-gradient(90deg, #1f2937 0%, #374151 100%);
-        padding: 2rem;
-        border-radius: 10px;
-        margin-bottom: 2rem;
-    }
-    .metric-card {
-        background: white;
-        padding: 1rem;
-        border-radius: 8px;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-        border-left: 4px solid #3b82f6;
-    }
-    .nav-button {
-        width: 100%;
-        padding: 0.75rem;
-        margin: 0.25rem 0;
-        border: none;
-        border-radius: 8px;
-        background: #f8fafc;
-        color: #1e293b;
-        font-weight: 500;
-        cursor: pointer;
-        transition: all 0.2s;
-    }
-    .nav-button:hover {
-        background: #e2e8f0;
-        transform: translateY(-1px);
-    }
-    .nav-button.active {
-        background: #3b82f6;
-        color: white;
-    }
-</style>
-""", unsafe_allow_html=True)
+st.markdown(f"<style>{_load_css()}</style>", unsafe_allow_html=True)
+
+# Page name -> (module, class or factory) providing the page object to render
+PAGES = {
+    'Macro View': ('src.macro.macro_view', 'MacroView'),
+    'Opportunities': ('src.opportunities.opportunity_detector', 'get_detector'),
+    'Portfolio': ('src.portfolio.portfolio_manager', 'PortfolioManager'),
+    'Reports': ('src.portfolio.reports', 'ReportGenerator'),
+    'Logs': ('src.ui.log_viewer', 'LogViewer')
+}
+
+@functools.lru_cache(maxsize=None)
+def _page_module(module_name: str):
+    """Import a page module once per process"""
+    return importlib.import_module(module_name)
 
 def main():
     # Log application start
@@ -104,35 +86,18 @@ def main():
     
     # Page routing
     current_page = st.session_state.current_page
-    logger.user_action("page_navigation", f"Navigated to {current_page}")
+    logger.user_action("page_navigation", "Navigated to " + current_page)
     
     try:
-        if current_page == 'Macro View':
-            logger.info("Loading Macro View module")
-            from src.macro.macro_view import MacroView
-            MacroView().render()
-        elif current_page == 'Opportunities':
-            logger.info("Loading Opportunities module")
-            from src.opportunities.opportunity_detector import OpportunityDetector
-            OpportunityDetector().render()
-        elif current_page == 'Portfolio':
-            logger.info("Loading Portfolio module")
-            from src.portfolio.portfolio_manager import PortfolioManager
-            PortfolioManager().render()
-        elif current_page == 'Reports':
-            logger.info("Loading Reports module")
-            from src.portfolio.reports import ReportGenerator
-            ReportGenerator().render()
-        elif current_page == 'Logs':
-            logger.info("Loading Logs module")
-            from src.ui.log_viewer import LogViewer
-            LogViewer().render()
+        logger.info("Loading %s module", current_page)
+        module_name, page_factory = PAGES[current_page]
+        getattr(_page_module(module_name), page_factory)().render()
     except ImportError as e:
-        logger.error(f"Module not found: {e}")
+        logger.error("Module not found: %s", e)
         st.error(f"Module not found: {e}")
         st.info("Some modules are still being implemented. Please check back shortly.")
     except Exception as e:
-        logger.error(f"An error occurred: {e}")
+        logger.error("An error occurred: %s", e)
         st.error(f"An error occurred: {e}")
         st.info("Please refresh the page or contact support if the issue persists.")
 
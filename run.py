@@ -4,56 +4,32 @@ HedgeLab Application Runner
 Simple script to start the HedgeLab Streamlit application
 """
 
-import os
 import sys
 import subprocess
-from pathlib import Path
+from src.utils.setup_check import PROJECT_ROOT, check_and_setup
 
-def check_and_setup():
-    """Check if setup is needed and run it if necessary"""
-    print("🔧 Checking HedgeLab setup...")
-    
-    # Check if we're in the right directory
-    if not Path("setup.py").exists():
-        print("❌ setup.py not found. Please run from HedgeLab directory.")
-        return False
-    
-    # Check if main dependencies are installed
+MAIN_SCRIPT = PROJECT_ROOT / "main.py"
+
+def start_streamlit():
+    """Serve main.py with Streamlit, in this process when its bootstrap API is available"""
     try:
-        import streamlit
-        import pandas
-        import plotly
-        import yfinance
-        print("✅ All dependencies are installed")
-        return True
-    except ImportError as e:
-        print(f"❌ Missing dependency: {e}")
-        print("🔧 Running setup to install dependencies...")
-        
-        try:
-            result = subprocess.run([sys.executable, "setup.py"], 
-                                  capture_output=True, text=True, timeout=60)
-            if result.returncode == 0:
-                print("✅ Setup completed successfully")
-                return True
-            else:
-                print(f"❌ Setup failed: {result.stderr}")
-                return False
-        except subprocess.TimeoutExpired:
-            print("❌ Setup timed out")
-            return False
-        except Exception as e:
-            print(f"❌ Setup error: {e}")
-            return False
+        from streamlit.web import bootstrap
+    except ImportError:
+        # Streamlit internals moved - go through its command line instead
+        subprocess.run([sys.executable, "-m", "streamlit", "run", str(MAIN_SCRIPT)], check=True)
+        return
+    
+    bootstrap.load_config_options(flag_options={})
+    bootstrap.run(str(MAIN_SCRIPT), False, [], flag_options={})
 
 def run_hedgelab():
     """Run the HedgeLab application"""
     print("🚀 Starting HedgeLab...")
     print("=" * 40)
     
-    # Check if we're in the right directory
-    if not Path("main.py").exists():
-        print("❌ main.py not found. Please run this script from the HedgeLab directory.")
+    # Check that the app sits next to this script
+    if not MAIN_SCRIPT.exists():
+        print(f"❌ main.py not found in {PROJECT_ROOT}.")
         return False
     
     # Check and run setup if needed
@@ -62,7 +38,7 @@ def run_hedgelab():
         return False
     
     # Check for .env file
-    if not Path(".env").exists():
+    if not (PROJECT_ROOT / ".env").exists():
         print("⚠️  No .env file found. Running in demo mode.")
         print("💡 Run 'python setup.py' to create environment configuration")
     
@@ -73,7 +49,7 @@ def run_hedgelab():
     print("-" * 40)
     
     try:
-        subprocess.run([sys.executable, "-m", "streamlit", "run", "main.py"], check=True)
+        start_streamlit()
     except KeyboardInterrupt:
         print("\n👋 HedgeLab stopped by user")
     except subprocess.CalledProcessError as e:
@@ -1,20 +1,45 @@
 import os
+import io
+import atexit
+import importlib.util
 import pandas as pd
-from typing import Optional, Dict, List, Any
-from datetime import datetime, date
+from typing import Optional, Dict, List, Any, Tuple, TYPE_CHECKING
+from contextlib import contextmanager
+from datetime import datetime, date, time
+from decimal import Decimal
 import streamlit as st
 
-# Try to import Supabase, but handle gracefully if not available
+# Supabase is only imported when credentials are configured (see Database.connect)
+SUPABASE_AVAILABLE = importlib.util.find_spec("supabase") is not None
+
+if TYPE_CHECKING:
+    from supabase import Client
+
+# Try to import psycopg2 for direct Postgres bulk loads, but fall back to the Supabase API
 try:
-    from supabase import create_client, Client
-    SUPABASE_AVAILABLE = True
+    import psycopg2
+    from psycopg2 import pool as pg_pool, sql
+    from psycopg2.extras import execute_values
+    PSYCOPG2_AVAILABLE = True
 except ImportError:
-    SUPABASE_AVAILABLE = False
-    Client = None
+    PSYCOPG2_AVAILABLE = False
+
+# Rows sent per upsert request for bulk writes
+UPSERT_BATCH_SIZE = 10_000
+
+# Rows fetched per request when paging through a table (Supabase's default PostgREST max-rows)
+PAGE_SIZE = 1000
+
+# Columns identifying a market_data row when loading through Postgres
+MARKET_DATA_KEY = ('symbol', 'date')
 
 class Database:
     _instance = None
-    _client: Optional[Client] = None
+    _client: Optional["Client"] = None
+    _connection_checked = False
+    _http_client = None
+    _pg_pool = None
+    _pg_pool_checked = False
     
     def __new__(cls):
         if cls._instance is None:
@@ -22,52 +47,75 @@ class Database:
         return cls._instance
     
     def __init__(self):
-        if self._client is None:
+        # Connect once per process; the outcome is kept until reset()
+        if not self._connection_checked:
             self.connect()
     
     def connect(self):
         """Initialize Supabase client"""
+        self._connection_checked = True
+        
+        url = os.getenv("SUPABASE_URL")
+        key = os.getenv("SUPABASE_KEY")
+        
+        if not url or not key:
+            st.warning("Supabase credentials not found. Using local storage mode.")
+            self._client = None
+            return
+        
         if not SUPABASE_AVAILABLE:
             st.warning("Supabase not available. Using local storage mode.")
             self._client = None
             return
             
         try:
-            url = os.getenv("SUPABASE_URL")
-            key = os.getenv("SUPABASE_KEY")
+            import httpx
+            from supabase import create_client, ClientOptions
             
-            if not url or not key:
-                st.warning("Supabase credentials not found. Using local storage mode.")
-                self._client = None
-                return
-                
-            self._client = create_client(url, key)
+            # One keep-alive HTTP client shared by every table call instead of a new connection each time
+            if self._http_client is None:
+                self._http_client = httpx.Client(
+                    http2=importlib.util.find_spec("h2") is not None,
+                    limits=httpx.Limits(max_connections=20, max_keepalive_connections=10),
+                    timeout=10.0
+                )
+                atexit.register(self._http_client.close)
+            
+            self._client = create_client(url, key, options=ClientOptions(httpx_client=self._http_client))
             st.success("✅ Connected to Supabase database")
         except Exception as e:
             st.error(f"Failed to connect to database: {e}")
             self._client = None
     
     @property
-    def client(self) -> Optional[Client]:
+    def client(self) -> Optional["Client"]:
         return self._client
     
     def is_connected(self) -> bool:
+        """Whether a client was created on connect (no network round-trip)"""
         return self._client is not None
+    
+    def reset(self):
+        """Discard the cached connection and connect again"""
+        self._client = None
+        self.connect()
 
     # Market Data Operations
     def save_market_data(self, data: pd.DataFrame) -> bool:
-        """Save market data to database"""
-        if not self.is_connected():
+        """Save market data to database (COPY through Postgres when DATABASE_URL is set)"""
+        pg = self._get_pg_pool()
+        if pg is None and not self.is_connected():
             return False
             
         try:
-            records = data.to_dict('records')
-            for record in records:
-                # Convert datetime objects to strings
-                if 'date' in record and isinstance(record['date'], (datetime, date)):
-                    record['date'] = record['date'].isoformat()
-                    
-            result = self._client.table('market_data').upsert(records).execute()
+            # Convert dates to strings for the whole column at once (columns of strings are sent as-is)
+            if 'date' in data.columns and not pd.api.types.is_string_dtype(data['date']):
+                data = data.assign(date=pd.to_datetime(data['date']).dt.strftime('%Y-%m-%d'))
+            
+            if pg is not None:
+                self._copy_market_data(data)
+            else:
+                self._upsert_batches('market_data', data.to_dict('records'))
             return True
         except Exception as e:
             st.error(f"Error saving market data: {e}")
@@ -75,19 +123,28 @@ class Database:
     
     def get_market_data(self, symbol: str, start_date: str = None, end_date: str = None) -> pd.DataFrame:
         """Retrieve market data from database"""
-        if not self.is_connected():
+        pg = self._get_pg_pool()
+        if pg is None and not self.is_connected():
             return pd.DataFrame()
             
-        try:
+        def build_query():
             query = self._client.table('market_data').select('*').eq('symbol', symbol)
             
             if start_date:
                 query = query.gte('date', start_date)
             if end_date:
                 query = query.lte('date', end_date)
-                
-            result = query.execute()
-            return pd.DataFrame(result.data)
+            return query.order('date')
+            
+        try:
+            if pg is not None:
+                filters = [('symbol', '=', symbol)]
+                if start_date:
+                    filters.append(('date', '>=', start_date))
+                if end_date:
+                    filters.append(('date', '<=', end_date))
+                return self._pg_select('market_data', filters, order='date')
+            return self._select_pages(build_query)
         except Exception as e:
             st.error(f"Error retrieving market data: {e}")
             return pd.DataFrame()
@@ -109,12 +166,41 @@ class Database:
             st.error(f"Error saving opportunity: {e}")
             return False
     
+    def save_opportunities(self, opportunities: List[Dict[str, Any]]) -> bool:
+        """Save many opportunities in one transaction (one insert request per batch without DATABASE_URL)"""
+        pg = self._get_pg_pool()
+        if pg is None and not self.is_connected():
+            return False
+        
+        try:
+            # Convert datetime objects to strings
+            records = [
+                {**opportunity, 'date': opportunity['date'].isoformat()}
+                if isinstance(opportunity.get('date'), (datetime, date)) else opportunity
+                for opportunity in opportunities
+            ]
+            
+            if pg is not None:
+                self._insert_rows('opportunities', records)
+            else:
+                for start in range(0, len(records), UPSERT_BATCH_SIZE):
+                    self._client.table('opportunities').insert(records[start:start + UPSERT_BATCH_SIZE]).execute()
+            return True
+        except Exception as e:
+            st.error(f"Error saving opportunities: {e}")
+            return False
+    
     def get_opportunities(self, strategy: str = None, limit: int = 100) -> pd.DataFrame:
         """Retrieve opportunities from database"""
-        if not self.is_connected():
+        pg = self._get_pg_pool()
+        if pg is None and not self.is_connected():
             return pd.DataFrame()
             
         try:
+            if pg is not None:
+                filters = [('strategy', '=', strategy)] if strategy else []
+                return self._pg_select('opportunities', filters, order='date', desc=True, limit=limit)
+            
             query = self._client.table('opportunities').select('*').limit(limit)
             
             if strategy:
@@ -145,10 +231,15 @@ class Database:
     
     def get_trades(self, symbol: str = None) -> pd.DataFrame:
         """Retrieve trades from database"""
-        if not self.is_connected():
+        pg = self._get_pg_pool()
+        if pg is None and not self.is_connected():
             return pd.DataFrame()
             
         try:
+            if pg is not None:
+                filters = [('symbol', '=', symbol)] if symbol else []
+                return self._pg_select('trades', filters, order='timestamp', desc=True)
+            
             query = self._client.table('trades').select('*')
             
             if symbol:
@@ -162,10 +253,14 @@ class Database:
     
     def get_positions(self) -> pd.DataFrame:
         """Retrieve current positions from database"""
-        if not self.is_connected():
+        pg = self._get_pg_pool()
+        if pg is None and not self.is_connected():
             return pd.DataFrame()
             
         try:
+            if pg is not None:
+                return self._pg_select('positions')
+            
             result = self._client.table('positions').select('*').execute()
             return pd.DataFrame(result.data)
         except Exception as e:
@@ -202,7 +297,7 @@ class Database:
             if 'date' in performance and isinstance(performance['date'], (datetime, date)):
                 performance['date'] = performance['date'].isoformat()
                 
-            result = self._client.table('portfolio_performance').upsert(performance).execute()
+            self._upsert_batches('portfolio_performance', [performance])
             return True
         except Exception as e:
             st.error(f"Error saving portfolio performance: {e}")
@@ -210,10 +305,19 @@ class Database:
     
     def get_portfolio_performance(self, start_date: str = None, end_date: str = None) -> pd.DataFrame:
         """Retrieve portfolio performance data"""
-        if not self.is_connected():
+        pg = self._get_pg_pool()
+        if pg is None and not self.is_connected():
             return pd.DataFrame()
             
         try:
+            if pg is not None:
+                filters = []
+                if start_date:
+                    filters.append(('date', '>=', start_date))
+                if end_date:
+                    filters.append(('date', '<=', end_date))
+                return self._pg_select('portfolio_performance', filters, order='date', desc=True)
+            
             query = self._client.table('portfolio_performance').select('*')
             
             if start_date:
@@ -226,6 +330,139 @@ class Database:
         except Exception as e:
             st.error(f"Error retrieving portfolio performance: {e}")
             return pd.DataFrame()
+    
+    def _get_pg_pool(self):
+        """Create the Postgres connection pool on first use (None without DATABASE_URL)"""
+        if not self._pg_pool_checked:
+            self._pg_pool_checked = True
+            dsn = os.getenv("DATABASE_URL")
+            if PSYCOPG2_AVAILABLE and dsn:
+                try:
+                    self._pg_pool = pg_pool.ThreadedConnectionPool(2, 10, dsn)
+                    atexit.register(self._pg_pool.closeall)
+                except Exception as e:
+                    st.warning(f"Could not connect to Postgres, using the Supabase API: {e}")
+        return self._pg_pool
+    
+    @contextmanager
+    def get_pg_conn(self):
+        """Borrow a connection from the Postgres pool, dropping it instead of returning it if it broke"""
+        pg = self._get_pg_pool()
+        if pg is None:
+            raise RuntimeError("Postgres connection pool not available (set DATABASE_URL)")
+        
+        conn = pg.getconn()
+        if conn.closed:
+            # Closed by the server while idle in the pool
+            pg.putconn(conn, close=True)
+            conn = pg.getconn()
+        
+        broken = False
+        try:
+            yield conn
+        except (psycopg2.OperationalError, psycopg2.InterfaceError):
+            broken = True
+            raise
+        finally:
+            pg.putconn(conn, close=broken or bool(conn.closed))
+    
+    def _copy_market_data(self, data: pd.DataFrame):
+        """Stream rows into market_data with COPY, upserting on MARKET_DATA_KEY via a temp table"""
+        buffer = io.StringIO()
+        data.to_csv(buffer, index=False, header=False)
+        buffer.seek(0)
+        
+        columns = sql.SQL(', ').join(map(sql.Identifier, data.columns))
+        updates = [sql.SQL('{0} = EXCLUDED.{0}').format(sql.Identifier(column))
+                   for column in data.columns if column not in MARKET_DATA_KEY]
+        on_conflict = (sql.SQL('DO UPDATE SET {}').format(sql.SQL(', ').join(updates))
+                       if updates else sql.SQL('DO NOTHING'))
+        
+        with self.get_pg_conn() as conn, conn, conn.cursor() as cur:
+            cur.execute("CREATE TEMP TABLE market_data_load (LIKE market_data INCLUDING DEFAULTS) ON COMMIT DROP")
+            cur.copy_expert(sql.SQL("COPY market_data_load ({}) FROM STDIN WITH CSV").format(columns), buffer)
+            cur.execute(sql.SQL(
+                "INSERT INTO market_data ({columns}) SELECT {columns} FROM market_data_load "
+                "ON CONFLICT ({key}) {on_conflict}"
+            ).format(columns=columns, key=sql.SQL(', ').join(map(sql.Identifier, MARKET_DATA_KEY)),
+                     on_conflict=on_conflict))
+    
+    def _insert_rows(self, table: str, records: List[Dict[str, Any]]):
+        """INSERT records as multi-row statements inside a single Postgres transaction"""
+        if not records:
+            return
+        
+        columns = list(records[0])
+        query = sql.SQL("INSERT INTO {} ({}) VALUES %s").format(
+            sql.Identifier(table), sql.SQL(', ').join(map(sql.Identifier, columns))
+        )
+        rows = [tuple(record.get(column) for column in columns) for record in records]
+        
+        with self.get_pg_conn() as conn, conn, conn.cursor() as cur:
+            execute_values(cur, query, rows, page_size=UPSERT_BATCH_SIZE)
+    
+    def _pg_select(self, table: str, filters: List[Tuple[str, str, Any]] = (), order: str = None,
+                   desc: bool = False, limit: int = None) -> pd.DataFrame:
+        """SELECT * over the Postgres pool; filters are (column, operator, value) triples joined with AND"""
+        query = sql.SQL("SELECT * FROM {}").format(sql.Identifier(table))
+        params = [value for _, _, value in filters]
+        if filters:
+            query += sql.SQL(" WHERE ") + sql.SQL(" AND ").join(
+                sql.SQL("{} {} %s").format(sql.Identifier(column), sql.SQL(operator))
+                for column, operator, _ in filters
+            )
+        if order:
+            query += sql.SQL(" ORDER BY {} {}").format(sql.Identifier(order), sql.SQL("DESC" if desc else "ASC"))
+        if limit is not None:
+            query += sql.SQL(" LIMIT %s")
+            params.append(limit)
+        
+        with self.get_pg_conn() as conn, conn, conn.cursor() as cur:
+            cur.execute(query, params)
+            data = pd.DataFrame(cur.fetchall(), columns=[column.name for column in cur.description])
+        return self._as_api_types(data)
+    
+    def _as_api_types(self, data: pd.DataFrame) -> pd.DataFrame:
+        """Turn Decimal and date/time values into floats and ISO strings, as the Supabase API returns them"""
+        for column in data.columns:
+            values = data[column].dropna()
+            if values.empty:
+                continue
+            if isinstance(values.iat[0], Decimal):
+                data[column] = data[column].astype(float)
+            elif isinstance(values.iat[0], (datetime, date, time)):
+                data[column] = data[column].map(lambda value: value.isoformat() if pd.notna(value) else None)
+        return data
+    
+    def _select_pages(self, build_query) -> pd.DataFrame:
+        """Run a select one PAGE_SIZE range at a time so the server row limit cannot truncate it"""
+        frames = []
+        offset = 0
+        while True:
+            # Range parameters accumulate on a builder, so every page starts from a fresh query
+            rows = build_query().range(offset, offset + PAGE_SIZE - 1).execute().data
+            if rows:
+                frames.append(pd.DataFrame(rows))
+            if len(rows) < PAGE_SIZE:
+                break
+            offset += PAGE_SIZE
+        
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    
+    def _upsert_batches(self, table: str, records: List[Dict[str, Any]]):
+        """Upsert records with one request per UPSERT_BATCH_SIZE rows"""
+        for start in range(0, len(records), UPSERT_BATCH_SIZE):
+            self._client.table(table).upsert(records[start:start + UPSERT_BATCH_SIZE]).execute()
+
+class _LazyDatabase:
+    """Stand-in for the global Database that only connects when first used"""
+    
+    def __getattr__(self, name):
+        return getattr(Database(), name)
+    
+    def ensure_connected(self) -> bool:
+        """Connect now rather than on first use, so connection messages render where this is called"""
+        return Database().is_connected()
 
 # Global database instance
-db = Database() 
\ No newline at end of file
+db = _LazyDatabase() 
\ No newline at end of file
@@ -2,28 +2,148 @@ import yfinance as yf
 import pandas as pd
 import numpy as np
 import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import quote
 import feedparser
+import os
 import time
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+import json
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional, Tuple
 import streamlit as st
 from textblob import TextBlob
 
-# Import logger
+# Try to import curl_cffi (the browser-impersonating HTTP client yfinance prefers) to share one session
 try:
-    from ..utils.logger import logger
+    from curl_cffi import requests as curl_requests
+    CURL_CFFI_AVAILABLE = True
 except ImportError:
-    from utils.logger import logger
+    CURL_CFFI_AVAILABLE = False
+
+# Try to import orjson for faster JSON parsing, but fall back to the standard library
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Try to import VADER (lexicon lookup, far cheaper per headline than TextBlob), but fall back to TextBlob
+try:
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    _vader = SentimentIntensityAnalyzer()
+    VADER_AVAILABLE = True
+except ImportError:
+    VADER_AVAILABLE = False
+
+# Import logger
+from src.utils.logger import logger
+
+# Major market indices shown across the app
+MARKET_INDICES = {
+    'S&P 500': '^GSPC',
+    'NASDAQ': '^IXIC',
+    'Dow Jones': '^DJI',
+    'Russell 2000': '^RUT',
+    'VIX': '^VIX'
+}
+
+# Disk cache shared between processes (demo reruns, app restarts)
+CACHE_DIR = Path(".cache")
+
+# Set HEDGELAB_DISK_CACHE=0 to always go to Yahoo instead of serving fresh data from disk
+DISK_CACHE_ENABLED = os.getenv("HEDGELAB_DISK_CACHE", "1") != "0"
+
+# yfinance keeps timezone and cookie/crumb lookups in its own SQLite cache; keeping it
+# next to ours lets reruns skip those requests. yfinance rejects caching sessions such
+# as requests_cache, so price responses are cached by the bar store instead.
+if DISK_CACHE_ENABLED:
+    yf.set_tz_cache_location(str(CACHE_DIR / "yfinance"))
+
+# Per-symbol daily bar store, extended with delta downloads
+BARS_DIR = Path("data") / "bars"
+
+# Yahoo chart API, queried directly when only closing prices are needed
+CHART_URL = "https://query1.finance.yahoo.com/v8/finance/chart/{symbol}"
+CHART_RANGES = {'1d', '5d', '1mo', '3mo', '6mo', '1y', '2y', '5y', '10y', 'ytd', 'max'}
+
+# Yield curve points: (maturity, proxy symbol, years, multiplier). Only 3M, 10Y and 30Y are
+# quoted; the other maturities are interpolated by scaling the nearest quoted rate.
+YIELD_CURVE = (
+    ('1M', '^IRX', 0.08, 0.5),
+    ('3M', '^IRX', 0.25, 1.0),
+    ('6M', '^IRX', 0.5, 0.6),
+    ('1Y', '^IRX', 1, 0.7),
+    ('2Y', '^TNX', 2, 0.7),
+    ('3Y', '^TNX', 3, 0.8),
+    ('5Y', '^TNX', 5, 0.9),
+    ('7Y', '^TNX', 7, 1.0),
+    ('10Y', '^TNX', 10, 1.0),
+    ('20Y', '^TYX', 20, 0.95),
+    ('30Y', '^TYX', 30, 1.0)
+)
+
+# Calendar periods that can be served from the bar store ("Nd" periods are trading days)
+PERIOD_OFFSETS = {
+    '1mo': pd.DateOffset(months=1),
+    '3mo': pd.DateOffset(months=3),
+    '6mo': pd.DateOffset(months=6),
+    '1y': pd.DateOffset(years=1),
+    '2y': pd.DateOffset(years=2),
+    '5y': pd.DateOffset(years=5)
+}
+
+# In-memory caches: key -> (fetched_at, data)
+_symbols_history: Dict[Tuple[str, str], Tuple[float, pd.DataFrame]] = {}
+_indices_history: Dict[Tuple[str, ...], Tuple[float, Dict]] = {}
+
+# Held while market indices are being refreshed in the background
+_indices_refresh_lock = threading.Lock()
+
+@functools.lru_cache(maxsize=512)
+def _get_ticker(symbol: str, session) -> yf.Ticker:
+    """Reuse Ticker objects (and the timezone/metadata they hold) across calls"""
+    return yf.Ticker(symbol, session=session)
 
 class MarketDataProvider:
     """Provides market data from various free sources"""
     
+    # (output key, Yahoo info key, default) for get_stock_info
+    _INFO_FIELDS = (
+        ('sector', 'sector', 'N/A'),
+        ('industry', 'industry', 'N/A'),
+        ('market_cap', 'marketCap', 0),
+        ('pe_ratio', 'trailingPE', 0),
+        ('price_to_book', 'priceToBook', 0),
+        ('dividend_yield', 'dividendYield', 0),
+        ('beta', 'beta', 0),
+        ('eps', 'trailingEps', 0),
+        ('revenue_growth', 'revenueGrowth', 0),
+        ('profit_margins', 'profitMargins', 0),
+        ('current_price', 'currentPrice', 0),
+        ('target_price', 'targetMeanPrice', 0),
+        ('recommendation', 'recommendationMean', 0),
+    )
+    
     def __init__(self):
         self.cache_duration = 15  # minutes
+        self.stale_cache_duration = 2 * self.cache_duration  # minutes a stale value may still be served
         self.rate_limit_delay = 2.0  # increased delay between API calls
         self.last_api_call = 0
         self.rate_limit_count = 0  # track rate limit hits
         self.max_retries = 3  # maximum retries before showing error
+        
+        # One session for every yfinance request; otherwise yfinance creates a new one per Ticker
+        self._yf_session = curl_requests.Session(impersonate="chrome") if CURL_CFFI_AVAILABLE else None
+        
+        # Keep-alive session for direct chart API requests
+        self._http = requests.Session()
+        self._http.mount("https://", HTTPAdapter(pool_connections=10, pool_maxsize=10))
+        self._http.headers['User-Agent'] = "Mozilla/5.0"
         logger.info("MarketDataProvider initialized")
         
     @st.cache_data(ttl=900)  # 15 minutes cache
@@ -32,6 +152,21 @@ class MarketDataProvider:
         start_time = time.time()
         logger.info(f"Fetching stock data for {symbol}, period: {period}")
         
+        cached = _self._get_cached_history(symbol, period)
+        if cached is None and not _self._is_stored_period(period):
+            cached = _self._get_disk_history(symbol, period)
+        if cached is not None:
+            return cached
+        
+        # Serve from the bar store without any HTTP if it was updated recently
+        bars = _self._read_bars(symbol)
+        covered = bars is not None and _self._slice_period(bars, period) is not None
+        if covered and DISK_CACHE_ENABLED and time.time() - _self._bars_file(symbol).stat().st_mtime < _self.cache_duration * 60:
+            data = _self._slice_period(bars, period)
+            _self._store_history(symbol, period, data)
+            logger.debug(f"Bar store hit for {symbol} ({period})")
+            return data.copy()
+        
         # Check if we should skip due to too many rate limits
         if _self.rate_limit_count >= _self.max_retries:
             st.error(f"⚠️ API rate limit exceeded for {symbol}. Please wait a few minutes before trying again.")
@@ -46,12 +181,25 @@ class MarketDataProvider:
                 logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f}s")
                 time.sleep(sleep_time)
             
-            ticker = yf.Ticker(symbol)
-            data = ticker.history(period=period)
+            ticker = _get_ticker(symbol, _self._yf_session)
+            if covered:
+                # Only download bars from the last stored one onwards (it may have been intraday)
+                data = ticker.history(start=bars['Date'].iat[-1].strftime('%Y-%m-%d'))
+            else:
+                data = ticker.history(period=period)
             data.reset_index(inplace=True)
             data['Symbol'] = symbol
             
             _self.last_api_call = time.time()
+            if _self._is_stored_period(period):
+                data = _self._update_bars(symbol, bars, data)
+                data = _self._slice_period(data, period)
+                if data is None:
+                    data = pd.DataFrame()
+            elif not data.empty:
+                _self._store_disk_history(symbol, period, data)
+            if not data.empty:
+                _self._store_history(symbol, period, data)
             response_time = time.time() - start_time
             
             # Reset rate limit counter on success
@@ -81,82 +229,146 @@ class MarketDataProvider:
             logger.error(f"Error fetching data for {symbol}: {e}")
             return pd.DataFrame()
     
+    def prefetch(self, symbol_periods: List[Tuple[str, str]], include_indices: bool = True):
+        """Warm the caches for several (symbol, period) requests concurrently"""
+        logger.info(f"Prefetching {len(symbol_periods)} symbols")
+        with ThreadPoolExecutor(max_workers=len(symbol_periods) + 1) as executor:
+            futures = [executor.submit(self.get_stock_data, symbol, period) for symbol, period in symbol_periods]
+            if include_indices:
+                futures.append(executor.submit(self.get_market_indices))
+            for future in futures:
+                future.result()
+    
     @st.cache_data(ttl=900)
     def get_multiple_stocks(_self, symbols: List[str], period: str = "1y") -> pd.DataFrame:
         """Get data for multiple stocks"""
         all_data = []
-        for symbol in symbols:
-            data = _self.get_stock_data(symbol, period)
-            if not data.empty:
-                all_data.append(data)
+        if len(symbols) > 3:
+            # One batched request instead of one rate-limited request per symbol
+            try:
+                all_data = _self._download_history(symbols, period)
+            except Exception as e:
+                logger.warning(f"Batched download failed, fetching symbols one by one: {e}")
+        
+        if not all_data:
+            with ThreadPoolExecutor(max_workers=8) as executor:
+                results = executor.map(lambda symbol: _self.get_stock_data(symbol, period), symbols)
+                all_data = [data for data in results if not data.empty]
         
         if all_data:
-            return pd.concat(all_data, ignore_index=True)
+            combined = pd.concat(all_data, ignore_index=True)
+            # Store the repeated symbol as a small integer code per row instead of a string
+            combined['Symbol'] = combined['Symbol'].astype('category')
+            return combined
         return pd.DataFrame()
     
-    @st.cache_data(ttl=3600)  # 1 hour cache
-    def get_market_indices(_self) -> Dict[str, float]:
+    @st.cache_data(ttl=60, show_spinner=False)  # Quotes, so kept far shorter than the 15-minute history cache
+    def get_latest_prices(_self, symbols: List[str]) -> pd.Series:
+        """Latest price (today's close so far during market hours) per symbol, NaN where no quote came back"""
+        if not symbols:
+            return pd.Series(dtype=float)
+        
+        try:
+            closes = _self._download_closes(list(symbols), period="5d")
+        except Exception as e:
+            logger.warning(f"Could not fetch latest prices for {', '.join(symbols)}: {e}")
+            return pd.Series(np.nan, index=list(symbols))
+        
+        current, _ = _self._last_two_closes(closes)
+        return current.reindex(list(symbols))
+    
+    def get_market_indices(self) -> Dict[str, float]:
         """Get major market indices"""
+        # Not wrapped in st.cache_data: its entry would keep hiding the background refresh below
+        cache_key = tuple(MARKET_INDICES.values())
+        cached = self._get_cached_indices(cache_key)
+        if cached is not None:
+            results, age = cached
+            if age >= self.cache_duration * 60:
+                # Stale-while-revalidate: answer with the cached values, refresh them in the background
+                self._refresh_indices_in_background(cache_key)
+            return results
+        
+        # Nothing cached, or too stale to serve: fetch now
+        return self._fetch_market_indices(cache_key)
+    
+    def _refresh_indices_in_background(self, cache_key: Tuple[str, ...]):
+        """Start refreshing market indices on a daemon thread unless a refresh is already running"""
+        if not _indices_refresh_lock.acquire(blocking=False):
+            return
+        
+        def refresh():
+            try:
+                # No ScriptRunContext on this thread, so failures go to the log only
+                self._fetch_market_indices(cache_key, report=False)
+            finally:
+                _indices_refresh_lock.release()
+        
+        logger.debug("Refreshing stale market indices in the background")
+        threading.Thread(target=refresh, daemon=True).start()
+    
+    def _fetch_market_indices(self, cache_key: Tuple[str, ...], report: bool = True) -> Dict[str, float]:
+        """Download major market indices and cache them; report=False keeps failures out of the page"""
         start_time = time.time()
         logger.info("Fetching market indices")
         
         try:
-            indices = {
-                'S&P 500': '^GSPC',
-                'NASDAQ': '^IXIC',
-                'Dow Jones': '^DJI',
-                'Russell 2000': '^RUT',
-                'VIX': '^VIX'
-            }
+            indices = MARKET_INDICES
             
             results = {}
             rate_limit_hit = False
             
-            for name, symbol in indices.items():
-                try:
-                    # Rate limiting
-                    current_time = time.time()
-                    time_since_last_call = current_time - _self.last_api_call
-                    if time_since_last_call < _self.rate_limit_delay:
-                        sleep_time = _self.rate_limit_delay - time_since_last_call
-                        logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f}s")
-                        time.sleep(sleep_time)
-                    
-                    logger.debug(f"Fetching {name} ({symbol})")
-                    ticker = yf.Ticker(symbol)
-                    data = ticker.history(period="2d")
-                    
-                    _self.last_api_call = time.time()
+            try:
+                # Rate limiting
+                current_time = time.time()
+                time_since_last_call = current_time - self.last_api_call
+                if time_since_last_call < self.rate_limit_delay:
+                    sleep_time = self.rate_limit_delay - time_since_last_call
+                    logger.debug(f"Rate limiting: sleeping for {sleep_time:.2f}s")
+                    time.sleep(sleep_time)
+                
+                # One batched request for all indices instead of one per ticker
+                logger.debug(f"Fetching indices: {', '.join(indices.values())}")
+                closes = self._download_closes(list(indices.values()), period="2d")
+                
+                self.last_api_call = time.time()
+                
+                if not closes.empty:
+                    current, previous = self._last_two_closes(closes)
+                    changes = (current / previous - 1.0) * 100.0
                     
-                    if not data.empty:
-                        current = data['Close'].iloc[-1]
-                        previous = data['Close'].iloc[-2]
-                        change = ((current - previous) / previous) * 100
+                    for name, symbol in indices.items():
+                        if symbol not in closes.columns or pd.isna(current[symbol]) or pd.isna(changes[symbol]):
+                            logger.warning(f"No data returned for {name}")
+                            continue
+                        
                         results[name] = {
-                            'value': current,
-                            'change': change,
+                            'value': current[symbol],
+                            'change': changes[symbol],
                             'symbol': symbol
                         }
-                        logger.debug(f"Successfully fetched {name}: {current:.2f} ({change:+.2f}%)")
-                    else:
-                        logger.warning(f"No data returned for {name}")
-                        
-                except Exception as e:
-                    error_msg = str(e)
-                    logger.api_call(f"yfinance_index_{symbol}", "FAILED", None, error_msg)
+                        logger.debug(f"Successfully fetched {name}: {current[symbol]:.2f} ({changes[symbol]:+.2f}%)")
+                else:
+                    logger.warning("No data returned for market indices")
                     
-                    # Check for rate limiting
-                    if "Too Many Requests" in error_msg or "Rate limited" in error_msg or "429" in error_msg:
-                        _self.rate_limit_count += 1
-                        logger.rate_limit(f"yfinance_index_{symbol}")
-                        rate_limit_hit = True
-                        st.warning(f"Rate limited for {name} ({_self.rate_limit_count}/{_self.max_retries}). Using fallback data.")
-                        
-                        # Increase delay for next call
-                        _self.rate_limit_delay = min(_self.rate_limit_delay * 1.5, 10.0)
-                    else:
-                        logger.warning(f"Error fetching {name}: {e}")
-                        st.warning(f"Error fetching {name}: {e}")
+            except Exception as e:
+                error_msg = str(e)
+                logger.api_call("yfinance_indices_batch", "FAILED", None, error_msg)
+                
+                # Check for rate limiting
+                if "Too Many Requests" in error_msg or "Rate limited" in error_msg or "429" in error_msg:
+                    self.rate_limit_count += 1
+                    logger.rate_limit("yfinance_indices_batch")
+                    rate_limit_hit = True
+                    if report:
+                        st.warning(f"Rate limited for market indices ({self.rate_limit_count}/{self.max_retries}). Using fallback data.")
+                    
+                    # Increase delay for next call
+                    self.rate_limit_delay = min(self.rate_limit_delay * 1.5, 10.0)
+                else:
+                    logger.warning(f"Error fetching market indices: {e}")
+                    if report:
+                        st.warning(f"Error fetching market indices: {e}")
             
             response_time = time.time() - start_time
             
@@ -168,9 +380,11 @@ class MarketDataProvider:
             
             # If rate limited or no results, show error
             if not results or rate_limit_hit:
-                st.error("⚠️ API rate limit exceeded for market indices. Please wait a few minutes before trying again.")
+                if report:
+                    st.error("⚠️ API rate limit exceeded for market indices. Please wait a few minutes before trying again.")
                 return {}
             
+            self._store_indices(cache_key, results)
             return results
             
         except Exception as e:
@@ -178,10 +392,11 @@ class MarketDataProvider:
             logger.api_call("yfinance_market_indices", "FAILED", response_time, str(e))
             
             logger.error(f"Error fetching market indices: {e}")
-            st.error(f"Error fetching market indices: {e}")
+            if report:
+                st.error(f"Error fetching market indices: {e}")
             return {}
     
-    @st.cache_data(ttl=3600)
+    @st.cache_data(ttl=3600, show_spinner=False)
     def get_treasury_rates(_self) -> Dict[str, float]:
         """Get Treasury rates"""
         try:
@@ -191,28 +406,28 @@ class MarketDataProvider:
                 '30Y': '^TYX'
             }
             
+            # One batched request for all rates instead of one per ticker
+            closes = _self._download_closes(list(treasury_symbols.values()), period="2d")
+            current, previous = _self._last_two_closes(closes)
+            changes = current - previous
+            
             results = {}
             for name, symbol in treasury_symbols.items():
-                try:
-                    ticker = yf.Ticker(symbol)
-                    data = ticker.history(period="2d")
-                    if not data.empty:
-                        current = data['Close'].iloc[-1]
-                        previous = data['Close'].iloc[-2]
-                        change = current - previous
-                        results[name] = {
-                            'value': current,
-                            'change': change
-                        }
-                except Exception as e:
-                    st.warning(f"Error fetching {name} Treasury: {e}")
+                if pd.isna(changes.get(symbol)):
+                    logger.warning(f"No data returned for {name} Treasury")
+                    continue
+                
+                results[name] = {
+                    'value': current[symbol],
+                    'change': changes[symbol]
+                }
                     
             return results
         except Exception as e:
             st.error(f"Error fetching treasury rates: {e}")
             return {}
     
-    @st.cache_data(ttl=3600)
+    @st.cache_data(ttl=3600, show_spinner=False)
     def get_commodities(_self) -> Dict[str, float]:
         """Get commodity prices"""
         try:
@@ -223,28 +438,28 @@ class MarketDataProvider:
                 'Natural Gas': 'NG=F'
             }
             
+            # One batched request for all commodities instead of one per ticker
+            closes = _self._download_closes(list(commodities.values()), period="2d")
+            current, previous = _self._last_two_closes(closes)
+            changes = (current / previous - 1.0) * 100.0
+            
             results = {}
             for name, symbol in commodities.items():
-                try:
-                    ticker = yf.Ticker(symbol)
-                    data = ticker.history(period="2d")
-                    if not data.empty:
-                        current = data['Close'].iloc[-1]
-                        previous = data['Close'].iloc[-2]
-                        change = ((current - previous) / previous) * 100
-                        results[name] = {
-                            'value': current,
-                            'change': change
-                        }
-                except Exception as e:
-                    st.warning(f"Error fetching {name}: {e}")
+                if pd.isna(changes.get(symbol)):
+                    logger.warning(f"No data returned for {name}")
+                    continue
+                
+                results[name] = {
+                    'value': current[symbol],
+                    'change': changes[symbol]
+                }
                     
             return results
         except Exception as e:
             st.error(f"Error fetching commodities: {e}")
             return {}
     
-    @st.cache_data(ttl=1800)  # 30 minutes cache
+    @st.cache_data(ttl=1800, show_spinner=False)  # 30 minutes cache
     def get_financial_news(_self, limit: int = 20) -> List[Dict]:
         """Get financial news from RSS feeds"""
         try:
@@ -254,19 +469,24 @@ class MarketDataProvider:
                 'https://www.marketwatch.com/rss/topstories'
             ]
             
+            # Fetch all feeds at once rather than one after another
+            with ThreadPoolExecutor(max_workers=len(news_sources)) as executor:
+                futures = [executor.submit(feedparser.parse, source) for source in news_sources]
+            
             all_news = []
-            for source in news_sources:
+            for source, future in zip(news_sources, futures):
                 try:
-                    feed = feedparser.parse(source)
+                    feed = future.result()
                     for entry in feed.entries[:limit//len(news_sources)]:
                         # Simple sentiment analysis
-                        sentiment = TextBlob(entry.title + " " + entry.get('summary', '')).sentiment.polarity
+                        sentiment = _self._sentiment(entry.title + " " + entry.get('summary', ''))
                         
                         all_news.append({
                             'title': entry.title,
                             'summary': entry.get('summary', '')[:200] + '...',
                             'link': entry.link,
                             'published': entry.get('published', ''),
+                            'published_at': _self._published_at(entry.get('published', '')),
                             'sentiment': sentiment,
                             'source': source.split('/')[2]  # Extract domain
                         })
@@ -274,35 +494,25 @@ class MarketDataProvider:
                     st.warning(f"Error fetching news from {source}: {e}")
             
             # Sort by publication date (newest first)
-            all_news.sort(key=lambda x: x.get('published', ''), reverse=True)
+            all_news.sort(key=lambda x: x['published_at'], reverse=True)
             return all_news[:limit]
         except Exception as e:
             st.error(f"Error fetching news: {e}")
             return []
     
+    @st.cache_data(ttl=3600, show_spinner=False)
     def get_stock_info(_self, symbol: str) -> Dict:
         """Get detailed stock information"""
         try:
-            ticker = yf.Ticker(symbol)
+            # A fresh Ticker, as a Ticker keeps its info dict once fetched
+            ticker = yf.Ticker(symbol, session=_self._yf_session)
             info = ticker.info
             
             # Clean and extract relevant information
             stock_info = {
                 'symbol': symbol,
                 'name': info.get('longName', symbol),
-                'sector': info.get('sector', 'N/A'),
-                'industry': info.get('industry', 'N/A'),
-                'market_cap': info.get('marketCap', 0),
-                'pe_ratio': info.get('trailingPE', 0),
-                'price_to_book': info.get('priceToBook', 0),
-                'dividend_yield': info.get('dividendYield', 0),
-                'beta': info.get('beta', 0),
-                'eps': info.get('trailingEps', 0),
-                'revenue_growth': info.get('revenueGrowth', 0),
-                'profit_margins': info.get('profitMargins', 0),
-                'current_price': info.get('currentPrice', 0),
-                'target_price': info.get('targetMeanPrice', 0),
-                'recommendation': info.get('recommendationMean', 0)
+                **{key: info.get(info_key, default) for key, info_key, default in _self._INFO_FIELDS}
             }
             
             return stock_info
@@ -310,52 +520,276 @@ class MarketDataProvider:
             st.error(f"Error fetching stock info for {symbol}: {e}")
             return {}
     
-    @st.cache_data(ttl=3600)
+    @st.cache_data(ttl=3600, show_spinner=False)
     def get_yield_curve(_self) -> pd.DataFrame:
         """Get yield curve data"""
         try:
-            maturities = {
-                '1M': '^IRX',  # 3-month used as proxy
-                '3M': '^IRX',
-                '6M': '^IRX',
-                '1Y': '^IRX',
-                '2Y': '^TNX',  # 10-year used as proxy
-                '3Y': '^TNX',
-                '5Y': '^TNX',
-                '7Y': '^TNX',
-                '10Y': '^TNX',
-                '20Y': '^TYX',  # 30-year used as proxy
-                '30Y': '^TYX'
-            }
+            # The proxies repeat, so only download each distinct symbol once
+            symbols = list(dict.fromkeys(symbol for _, symbol, _, _ in YIELD_CURVE))
+            closes = _self._download_closes(symbols, period="1d")
+            latest = {symbol: _self._symbol_closes(closes, symbol) for symbol in symbols}
+            latest = {symbol: data.iloc[-1] for symbol, data in latest.items() if not data.empty}
             
             yield_data = []
-            for maturity, symbol in maturities.items():
-                try:
-                    ticker = yf.Ticker(symbol)
-                    data = ticker.history(period="1d")
-                    if not data.empty:
-                        rate = data['Close'].iloc[-1]
-                        # Simple interpolation for missing maturities
-                        if maturity in ['1M', '6M', '1Y']:
-                            rate = rate * (0.5 + 0.1 * ['1M', '6M', '1Y'].index(maturity))
-                        elif maturity in ['2Y', '3Y', '5Y', '7Y']:
-                            rate = rate * (0.7 + 0.1 * ['2Y', '3Y', '5Y', '7Y'].index(maturity))
-                        elif maturity in ['20Y']:
-                            rate = rate * 0.95
-                            
-                        yield_data.append({
-                            'maturity': maturity,
-                            'rate': rate,
-                            'years': {'1M': 0.08, '3M': 0.25, '6M': 0.5, '1Y': 1, '2Y': 2, 
-                                    '3Y': 3, '5Y': 5, '7Y': 7, '10Y': 10, '20Y': 20, '30Y': 30}[maturity]
-                        })
-                except Exception as e:
-                    st.warning(f"Error fetching yield for {maturity}: {e}")
+            for maturity, symbol, years, multiplier in YIELD_CURVE:
+                if symbol not in latest:
+                    logger.warning(f"No yield data returned for {maturity}")
+                    continue
+                
+                yield_data.append({
+                    'maturity': maturity,
+                    'rate': latest[symbol] * multiplier,
+                    'years': years
+                })
             
             return pd.DataFrame(yield_data)
         except Exception as e:
             st.error(f"Error fetching yield curve: {e}")
             return pd.DataFrame()
 
+    def _download_closes(self, symbols: List[str], period: str = "2d") -> pd.DataFrame:
+        """Closing prices for several symbols, one column per symbol"""
+        try:
+            with ThreadPoolExecutor(max_workers=len(symbols)) as executor:
+                closes = pd.DataFrame(dict(zip(symbols, executor.map(lambda symbol: self._chart_closes(symbol, period), symbols))))
+        except Exception as e:
+            if "429" in str(e):
+                raise
+            logger.warning(f"Chart API request failed, using yfinance: {e}")
+            return self._yf_download_closes(symbols, period)
+        
+        closes = closes.sort_index().dropna(how='all')
+        if self._is_stored_period(period) and period not in PERIOD_OFFSETS:
+            closes = closes.tail(int(period[:-1]))
+        return closes
+    
+    def _chart_closes(self, symbol: str, period: str) -> pd.Series:
+        """Daily closes for one symbol straight from the chart API, indexed by exchange date"""
+        response = self._http.get(
+            CHART_URL.format(symbol=quote(symbol, safe='')),
+            params={'range': period if period in CHART_RANGES else '5d', 'interval': '1d'},
+            timeout=5
+        )
+        response.raise_for_status()
+        payload = orjson.loads(response.content) if ORJSON_AVAILABLE else response.json()
+        result = payload['chart']['result'][0]
+        
+        timestamps = result.get('timestamp')
+        if not timestamps:
+            return pd.Series(dtype=float)
+        dates = (pd.to_datetime(timestamps, unit='s', utc=True)
+                 .tz_convert(result['meta'].get('exchangeTimezoneName', 'UTC'))
+                 .normalize().tz_localize(None))
+        closes = pd.Series(result['indicators']['quote'][0]['close'], index=dates, dtype=float)
+        return closes[~closes.index.duplicated(keep='last')]
+    
+    def _yf_download_closes(self, symbols: List[str], period: str = "2d") -> pd.DataFrame:
+        """Download closing prices for several symbols in one batched yfinance request"""
+        data = yf.download(symbols, period=period, group_by='ticker', threads=True,
+                           progress=False, session=self._yf_session)
+        if data.empty:
+            return pd.DataFrame()
+        
+        # Columns are (symbol, field); keep one Close column per symbol
+        closes = data.xs('Close', level=1, axis=1)
+        return closes.dropna(how='all')
+    
+    def _published_at(self, published: str) -> datetime:
+        """Parse an RSS publication date (RFC 822) to an aware datetime, oldest possible if missing"""
+        try:
+            parsed = parsedate_to_datetime(published)
+        except (TypeError, ValueError):
+            return datetime.min.replace(tzinfo=timezone.utc)
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=timezone.utc)
+    
+    def _sentiment(self, text: str) -> float:
+        """Sentiment score of a headline in [-1, 1]"""
+        if VADER_AVAILABLE:
+            return _vader.polarity_scores(text)['compound']
+        return TextBlob(text).sentiment.polarity
+    
+    def _symbol_closes(self, closes: pd.DataFrame, symbol: str) -> pd.Series:
+        """Closing prices of one symbol from a batched download, without missing days"""
+        if symbol not in closes.columns:
+            return pd.Series(dtype=float)
+        return closes[symbol].dropna()
+    
+    def _last_two_closes(self, closes: pd.DataFrame) -> Tuple[pd.Series, pd.Series]:
+        """Latest and previous valid close of every symbol, computed on the whole matrix at once"""
+        if closes.empty:
+            empty = pd.Series(np.nan, index=closes.columns)
+            return empty, empty
+        
+        values = closes.to_numpy(dtype=np.float64)
+        valid = ~np.isnan(values)
+        rows = np.arange(len(values))[:, None]
+        columns = np.arange(values.shape[1])
+        
+        # Row of the last and second to last non-missing value per column (-1 when there is none)
+        last = np.where(valid, rows, -1).max(axis=0)
+        before_last = np.where(valid & (rows < last), rows, -1).max(axis=0)
+        current = np.where(last >= 0, values[last, columns], np.nan)
+        previous = np.where(before_last >= 0, values[before_last, columns], np.nan)
+        return pd.Series(current, index=closes.columns), pd.Series(previous, index=closes.columns)
+    
+    def _download_history(self, symbols: List[str], period: str) -> List[pd.DataFrame]:
+        """Download price history for several symbols in one batched request"""
+        data = yf.download(symbols, period=period, group_by='ticker', threads=True,
+                           progress=False, session=self._yf_session)
+        if data.empty:
+            return []
+        
+        frames = []
+        downloaded = set(data.columns.get_level_values(0))
+        for symbol in symbols:
+            if symbol not in downloaded:
+                continue
+            history = data[symbol].dropna(how='all').rename_axis(columns=None).reset_index()
+            if history.empty:
+                logger.warning(f"No data returned for {symbol}")
+                continue
+            history['Symbol'] = symbol
+            self._store_history(symbol, period, history)
+            frames.append(history)
+        
+        logger.info(f"Fetched {len(frames)}/{len(symbols)} symbols in one batch")
+        return frames
+    
+    def _get_cached_history(self, symbol: str, period: str) -> Optional[pd.DataFrame]:
+        """Return cached price history from memory if still fresh"""
+        cached = _symbols_history.get((symbol, period))
+        if cached and time.time() - cached[0] < self.cache_duration * 60:
+            logger.debug(f"Memory cache hit for {symbol} ({period})")
+            return cached[1].copy()
+        return None
+    
+    def _store_history(self, symbol: str, period: str, data: pd.DataFrame):
+        """Store price history in memory"""
+        _symbols_history[(symbol, period)] = (time.time(), data.copy())
+    
+    def _history_file(self, symbol: str, period: str) -> Path:
+        return CACHE_DIR / "history" / f"{symbol}_{period}.parquet"
+    
+    def _get_disk_history(self, symbol: str, period: str) -> Optional[pd.DataFrame]:
+        """Return price history for periods the bar store cannot serve (ytd, max, ...) if still fresh"""
+        if not DISK_CACHE_ENABLED:
+            return None
+        
+        history_file = self._history_file(symbol, period)
+        try:
+            if history_file.exists() and time.time() - history_file.stat().st_mtime < self.cache_duration * 60:
+                data = pd.read_parquet(history_file)
+                self._store_history(symbol, period, data)
+                logger.debug(f"Disk cache hit for {symbol} ({period})")
+                return data
+        except Exception as e:
+            logger.warning(f"Could not read cached history for {symbol}: {e}")
+        return None
+    
+    def _store_disk_history(self, symbol: str, period: str, data: pd.DataFrame):
+        """Persist price history for periods the bar store cannot serve"""
+        try:
+            history_file = self._history_file(symbol, period)
+            history_file.parent.mkdir(parents=True, exist_ok=True)
+            data.to_parquet(history_file, index=False, compression='zstd')
+        except Exception as e:
+            logger.warning(f"Could not write cached history for {symbol}: {e}")
+    
+    def _bars_file(self, symbol: str) -> Path:
+        return BARS_DIR / f"{symbol}.parquet"
+    
+    def _read_bars(self, symbol: str) -> Optional[pd.DataFrame]:
+        """Load the stored daily bars for a symbol"""
+        bars_file = self._bars_file(symbol)
+        try:
+            if bars_file.exists():
+                bars = pd.read_parquet(bars_file)
+                return bars if not bars.empty else None
+        except Exception as e:
+            logger.warning(f"Could not read stored bars for {symbol}: {e}")
+        return None
+    
+    def _update_bars(self, symbol: str, bars: Optional[pd.DataFrame], new_data: pd.DataFrame) -> pd.DataFrame:
+        """Merge newly downloaded bars into the store and persist it"""
+        if bars is None:
+            merged = new_data
+        elif new_data.empty:
+            merged = bars
+        else:
+            merged = pd.concat([bars, new_data], ignore_index=True)
+            merged = merged.drop_duplicates(subset='Date', keep='last').sort_values('Date', ignore_index=True)
+        
+        try:
+            if not merged.empty:
+                BARS_DIR.mkdir(parents=True, exist_ok=True)
+                merged.to_parquet(self._bars_file(symbol), index=False, compression='zstd')
+        except Exception as e:
+            logger.warning(f"Could not write stored bars for {symbol}: {e}")
+        return merged
+    
+    def _is_stored_period(self, period: str) -> bool:
+        return period in PERIOD_OFFSETS or (period.endswith('d') and period[:-1].isdigit())
+    
+    def _slice_period(self, bars: pd.DataFrame, period: str) -> Optional[pd.DataFrame]:
+        """Cut stored bars down to a period, or None if they do not cover it"""
+        if bars.empty:
+            return None
+        
+        if period not in PERIOD_OFFSETS:
+            if not self._is_stored_period(period):
+                return None
+            rows = int(period[:-1])
+            if len(bars) < rows:
+                return None
+            return bars.tail(rows).reset_index(drop=True)
+        
+        cutoff = (pd.Timestamp.now(tz=bars['Date'].dt.tz) - PERIOD_OFFSETS[period]).normalize()
+        # Allow a few days of slack for weekends and holidays at the start of the period
+        if bars['Date'].iat[0] > cutoff + pd.Timedelta(days=4):
+            return None
+        return bars[bars['Date'] >= cutoff].reset_index(drop=True)
+    
+    def _indices_cache_file(self) -> Path:
+        return CACHE_DIR / "market_indices.json"
+    
+    def _get_cached_indices(self, key: Tuple[str, ...]) -> Optional[Tuple[Dict, float]]:
+        """Return cached market indices from memory or disk and their age in seconds, unless too stale to serve"""
+        cached = _indices_history.get(key)
+        if cached and time.time() - cached[0] < self.stale_cache_duration * 60:
+            logger.debug("Memory cache hit for market indices")
+            return dict(cached[1]), time.time() - cached[0]
+        
+        if not DISK_CACHE_ENABLED:
+            return None
+        
+        cache_file = self._indices_cache_file()
+        try:
+            if cache_file.exists():
+                fetched_at = cache_file.stat().st_mtime
+                if time.time() - fetched_at < self.stale_cache_duration * 60:
+                    payload = json.loads(cache_file.read_text())
+                    if tuple(payload['symbols']) == key:
+                        _indices_history[key] = (fetched_at, payload['results'])
+                        logger.debug("Disk cache hit for market indices")
+                        return dict(payload['results']), time.time() - fetched_at
+        except Exception as e:
+            logger.warning(f"Could not read market indices cache: {e}")
+        return None
+    
+    def _store_indices(self, key: Tuple[str, ...], results: Dict):
+        """Store market indices in memory and on disk"""
+        _indices_history[key] = (time.time(), results)
+        try:
+            CACHE_DIR.mkdir(exist_ok=True)
+            payload = {'symbols': list(key), 'results': results}
+            self._indices_cache_file().write_text(json.dumps(payload, default=float))
+        except Exception as e:
+            logger.warning(f"Could not write market indices cache: {e}")
+
+@st.cache_resource
+def get_market_data_provider() -> MarketDataProvider:
+    """Shared provider instance that survives Streamlit reruns"""
+    return MarketDataProvider()
+
 # Global market data provider instance
-market_data = MarketDataProvider() 
\ No newline at end of file
+market_data = get_market_data_provider() 
\ No newline at end of file
@@ -1,26 +1,41 @@
 import streamlit as st
 import pandas as pd
+import numpy as np
 import plotly.graph_objects as go
 from datetime import datetime, timedelta
-from src.data.market_data import market_data
+from src.data.market_data import get_market_data_provider
 from src.ui.components import (
     metric_card, create_line_chart, create_yield_curve_chart, 
     news_feed, loading_spinner, format_currency, format_percentage
 )
 
+@st.cache_data(ttl=900, show_spinner=False)
+def _trend_figure(trend_data: pd.DataFrame, title: str) -> go.Figure:
+    """Index trend chart, rebuilt only when its data changes rather than on every rerun"""
+    return create_line_chart(trend_data, 'Date', 'Close', title)
+
+@st.cache_data(ttl=900, show_spinner=False)
+def _yield_curve_figure(yield_data: pd.DataFrame) -> go.Figure:
+    """Yield curve chart, rebuilt only when its data changes rather than on every rerun"""
+    return create_yield_curve_chart(yield_data)
+
 class MacroView:
     """Macro economic dashboard showing market overview, yield curves, and economic indicators"""
     
     def __init__(self):
-        self.market_provider = market_data
+        self.market_provider = get_market_data_provider()
     
     def render(self):
         """Render the macro view dashboard"""
         st.markdown("## 🌍 Macro Economic View")
         st.markdown("---")
         
+        # Fetched once per render and shared by the sections that need it
+        with loading_spinner("Loading market data..."):
+            indices_data = self.market_provider.get_market_indices()
+        
         # Market Overview Section
-        self._render_market_overview()
+        self._render_market_overview(indices_data)
         st.markdown("---")
         
         # Yield Curve Section
@@ -39,12 +54,13 @@ class MacroView:
         with col2:
             self._render_economic_news()
     
-    def _render_market_overview(self):
+    def _render_market_overview(self, indices_data: dict = None):
         """Render market indices overview"""
         st.markdown("### 📊 Global Market Overview")
         
-        with loading_spinner("Loading market data..."):
-            indices_data = self.market_provider.get_market_indices()
+        if indices_data is None:
+            with loading_spinner("Loading market data..."):
+                indices_data = self.market_provider.get_market_indices()
         
         if not indices_data:
             st.error("Unable to load market data. Please check your connection.")
@@ -52,16 +68,16 @@ class MacroView:
         
         # Display market indices in metric cards
         cols = st.columns(len(indices_data))
-        for i, (name, data) in enumerate(indices_data.items()):
-            with cols[i]:
-                value = format_currency(data['value']) if name != 'VIX' else f"{data['value']:.2f}"
-                change = format_percentage(data['change'])
-                delta_color = "normal" if data['change'] >= 0 else "inverse"
+        for col, (name, data) in zip(cols, indices_data.items()):
+            price, change = data['value'], data['change']
+            with col:
+                value = format_currency(price) if name != 'VIX' else f"{price:.2f}"
+                delta_color = "normal" if change >= 0 else "inverse"
                 
                 metric_card(
                     title=name,
                     value=value,
-                    delta=f"{'+' if data['change'] >= 0 else ''}{change}",
+                    delta=f"{'+' if change >= 0 else ''}{format_percentage(change)}",
                     delta_color=delta_color
                 )
         
@@ -74,16 +90,15 @@ class MacroView:
         )
         
         if selected_index in indices_data:
+            # Every index's trend comes from one batched, cached download, so switching the selection is instant
+            trends = self.market_provider.get_multiple_stocks(
+                [data['symbol'] for data in indices_data.values()], period="1mo"
+            )
             symbol = indices_data[selected_index]['symbol']
-            trend_data = self.market_provider.get_stock_data(symbol, period="1mo")
+            trend_data = trends[trends['Symbol'] == symbol] if not trends.empty else trends
             
             if not trend_data.empty:
-                fig = create_line_chart(
-                    trend_data, 
-                    'Date', 
-                    'Close', 
-                    f"{selected_index} - 30 Day Trend"
-                )
+                fig = _trend_figure(trend_data, f"{selected_index} - 30 Day Trend")
                 st.plotly_chart(fig, use_container_width=True)
             else:
                 st.warning(f"No trend data available for {selected_index}")
@@ -96,13 +111,15 @@ class MacroView:
             yield_data = self.market_provider.get_yield_curve()
         
         if not yield_data.empty:
-            fig = create_yield_curve_chart(yield_data)
+            fig = _yield_curve_figure(yield_data)
             st.plotly_chart(fig, use_container_width=True)
             
             # Yield curve analysis
             if len(yield_data) >= 2:
-                short_term = yield_data[yield_data['years'] <= 2]['rate'].mean()
-                long_term = yield_data[yield_data['years'] >= 10]['rate'].mean()
+                years = yield_data['years'].to_numpy()
+                rates = yield_data['rate'].to_numpy()
+                short_term = np.nanmean(rates[years <= 2])
+                long_term = np.nanmean(rates[years >= 10])
                 spread = long_term - short_term
                 
                 if spread > 0:
@@ -123,12 +140,13 @@ class MacroView:
         
         if treasury_data:
             for name, data in treasury_data.items():
-                change_text = f"{'+' if data['change'] >= 0 else ''}{data['change']:.3f}%"
-                delta_color = "normal" if data['change'] >= 0 else "inverse"
+                rate, change = data['value'], data['change']
+                change_text = f"{'+' if change >= 0 else ''}{change:.3f}%"
+                delta_color = "normal" if change >= 0 else "inverse"
                 
                 metric_card(
                     title=f"{name} Treasury",
-                    value=f"{data['value']:.3f}%",
+                    value=f"{rate:.3f}%",
                     delta=change_text,
                     delta_color=delta_color
                 )
@@ -144,18 +162,19 @@ class MacroView:
         
         if commodities_data:
             for name, data in commodities_data.items():
-                change_text = f"{'+' if data['change'] >= 0 else ''}{format_percentage(data['change'])}"
-                delta_color = "normal" if data['change'] >= 0 else "inverse"
+                price, change = data['value'], data['change']
+                change_text = f"{'+' if change >= 0 else ''}{format_percentage(change)}"
+                delta_color = "normal" if change >= 0 else "inverse"
                 
                 # Format value based on commodity type
                 if 'Gold' in name or 'Silver' in name:
-                    value = f"${data['value']:.2f}/oz"
+                    value = f"${price:.2f}/oz"
                 elif 'Oil' in name:
-                    value = f"${data['value']:.2f}/bbl"
+                    value = f"${price:.2f}/bbl"
                 elif 'Gas' in name:
-                    value = f"${data['value']:.3f}/MMBtu"
+                    value = f"${price:.3f}/MMBtu"
                 else:
-                    value = f"${data['value']:.2f}"
+                    value = f"${price:.2f}"
                 
                 metric_card(
                     title=name,
@@ -175,8 +194,9 @@ class MacroView:
         
         if news_data:
             # News sentiment overview
-            positive_news = sum(1 for article in news_data if article.get('sentiment', 0) > 0.1)
-            negative_news = sum(1 for article in news_data if article.get('sentiment', 0) < -0.1)
+            sentiment = np.fromiter((article.get('sentiment', 0) for article in news_data), dtype=float, count=len(news_data))
+            positive_news = int((sentiment > 0.1).sum())
+            negative_news = int((sentiment < -0.1).sum())
             neutral_news = len(news_data) - positive_news - negative_news
             
             col1, col2, col3 = st.columns(3)
@@ -192,11 +212,12 @@ class MacroView:
         else:
             st.warning("Unable to load news data")
     
-    def _render_fear_greed_index(self):
+    def _render_fear_greed_index(self, indices_data: dict = None):
         """Render Fear & Greed Index (simplified version using VIX)"""
         st.markdown("### 😰😊 Market Sentiment")
         
-        indices_data = self.market_provider.get_market_indices()
+        if indices_data is None:
+            indices_data = self.market_provider.get_market_indices()
         if 'VIX' in indices_data:
             vix_value = indices_data['VIX']['value']
             
@@ -0,0 +1,164 @@
+import numpy as np
+from src.utils.jit import njit, prange
+
+@njit(cache=True)
+def rolling_mean_recurrence(values: np.ndarray, window: int) -> np.ndarray:
+    """Simple moving average in a single pass using a running window sum"""
+    n = values.shape[0]
+    out = np.empty(n)
+    total = 0.0
+    nan_count = 0
+    
+    for i in range(n):
+        # V[t] = V[t-1] + (x[t] - x[t-window]) / window, skipping NaNs like pandas does
+        if np.isnan(values[i]):
+            nan_count += 1
+        else:
+            total += values[i]
+        
+        if i >= window:
+            if np.isnan(values[i - window]):
+                nan_count -= 1
+            else:
+                total -= values[i - window]
+        
+        if i >= window - 1 and nan_count == 0:
+            out[i] = total / window
+        else:
+            out[i] = np.nan
+    
+    return out
+
+@njit(cache=True)
+def rolling_std_recurrence(values: np.ndarray, window: int) -> np.ndarray:
+    """Population (ddof=0) rolling standard deviation from running sums, skipping NaNs like pandas does"""
+    n = values.shape[0]
+    out = np.empty(n)
+    total = 0.0
+    total_sq = 0.0
+    nan_count = 0
+    
+    for i in range(n):
+        if np.isnan(values[i]):
+            nan_count += 1
+        else:
+            total += values[i]
+            total_sq += float(values[i]) ** 2  # Squared in float64 even for float32 input
+        
+        if i >= window:
+            if np.isnan(values[i - window]):
+                nan_count -= 1
+            else:
+                total -= values[i - window]
+                total_sq -= float(values[i - window]) ** 2
+        
+        if i >= window - 1 and nan_count == 0:
+            mean = total / window
+            # Running sums can leave a tiny negative variance on flat windows
+            out[i] = np.sqrt(max(total_sq / window - mean * mean, 0.0))
+        else:
+            out[i] = np.nan
+    
+    return out
+
+@njit(cache=True)
+def ema_recurrence(values: np.ndarray, span: int) -> np.ndarray:
+    """EMA with alpha = 2 / (span + 1), seeded at the first value (pandas ewm(span, min_periods=span, adjust=False))"""
+    n = values.shape[0]
+    out = np.empty(n)
+    alpha = 2.0 / (span + 1)
+    average = np.nan
+    seen = 0
+    
+    for i in range(n):
+        if not np.isnan(values[i]):
+            # Leading NaNs are skipped; later ones hold the previous average
+            average = values[i] if seen == 0 else (1 - alpha) * average + alpha * values[i]
+            seen += 1
+        out[i] = average if seen >= span else np.nan
+    
+    return out
+
+@njit(cache=True)
+def macd_lines(values: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9):
+    """MACD line, signal line and histogram (same windows and seeding as ta.trend.MACD)"""
+    macd = ema_recurrence(values, fast) - ema_recurrence(values, slow)
+    macd_signal = ema_recurrence(macd, signal)
+    return macd, macd_signal, macd - macd_signal
+
+@njit(cache=True)
+def bollinger_bands(values: np.ndarray, window: int = 20, n_std: float = 2.0):
+    """Middle, upper and lower Bollinger bands (same as ta.volatility.BollingerBands)"""
+    middle = rolling_mean_recurrence(values, window)
+    width = n_std * rolling_std_recurrence(values, window)
+    return middle, middle + width, middle - width
+
+@njit(cache=True)
+def wilder_rsi(values: np.ndarray, window: int = 14) -> np.ndarray:
+    """Wilder RSI (EMA of gains and losses with alpha = 1/window), skipping leading NaNs"""
+    n = values.shape[0]
+    out = np.empty(n)
+    alpha = 1.0 / window
+    avg_gain = 0.0
+    avg_loss = 0.0
+    seen = 0
+    
+    for i in range(n):
+        if seen == 0 and np.isnan(values[i]):
+            out[i] = np.nan
+            continue
+        
+        # The first bar and bars next to a gap count as no change, as with pandas diff().fillna(0)
+        change = values[i] - values[i - 1] if seen > 0 else 0.0
+        if np.isnan(change):
+            change = 0.0
+        
+        if seen == 0:
+            avg_gain = max(change, 0.0)
+            avg_loss = max(-change, 0.0)
+        else:
+            avg_gain = (1 - alpha) * avg_gain + alpha * max(change, 0.0)
+            avg_loss = (1 - alpha) * avg_loss + alpha * max(-change, 0.0)
+        seen += 1
+        
+        if seen < window:
+            out[i] = np.nan
+        elif avg_loss == 0:
+            out[i] = 100.0
+        else:
+            out[i] = 100 - 100 / (1 + avg_gain / avg_loss)
+    
+    return out
+
+# Row order of the array returned by batch_indicators
+BATCH_COLUMNS = ('MA20', 'MA50', 'RSI', 'MACD', 'MACD_signal', 'MACD_hist',
+                 'BB_upper', 'BB_lower', 'BB_middle', 'Volume_SMA')
+
+@njit(parallel=True, cache=True)
+def batch_indicators(closes: np.ndarray, volumes: np.ndarray) -> np.ndarray:
+    """All scanner indicators for (n_symbols, n_days) close and volume matrices, as (len(BATCH_COLUMNS), n_symbols, n_days)"""
+    n_symbols, n_days = closes.shape
+    out = np.empty((10, n_symbols, n_days), dtype=closes.dtype)
+    
+    # Symbols are independent, so the rows are spread across cores
+    for row in prange(n_symbols):
+        close = closes[row]
+        out[0, row] = rolling_mean_recurrence(close, 20)
+        out[1, row] = rolling_mean_recurrence(close, 50)
+        out[2, row] = wilder_rsi(close, 14)
+        out[3, row], out[4, row], out[5, row] = macd_lines(close)
+        out[8, row], out[6, row], out[7, row] = bollinger_bands(close)
+        out[9, row] = rolling_mean_recurrence(volumes[row], 20)
+    
+    return out
+
+def warm_up() -> None:
+    """Compile (or load from the on-disk cache) every kernel for the array types the app passes in"""
+    series = np.linspace(100.0, 110.0, 60)
+    rolling_mean_recurrence(series, 20)
+    wilder_rsi(series, 14)
+    macd_lines(series)
+    bollinger_bands(series)
+    
+    matrix = np.tile(series.astype(np.float32), (2, 1))
+    batch_indicators(matrix, matrix)
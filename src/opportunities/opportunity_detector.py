@@ -1,16 +1,93 @@
 import streamlit as st
 import pandas as pd
 import numpy as np
+import heapq
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
-import ta
+from typing import Dict, List, Any, NamedTuple, Optional, Tuple
+from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
 from src.data.market_data import market_data
 from src.data.database import db
+from src.opportunities.indicators import (
+    rolling_mean_recurrence, macd_lines, bollinger_bands, wilder_rsi, batch_indicators, BATCH_COLUMNS, warm_up
+)
 from src.ui.components import (
     display_opportunities_table, filter_sidebar, loading_spinner,
     create_candlestick_chart, metric_card, format_currency, format_percentage
 )
 
+# Try to import TA-Lib (C implementation of the moving averages), but fall back to numba if not available
+try:
+    import talib
+    TALIB_AVAILABLE = True
+except ImportError:
+    TALIB_AVAILABLE = False
+
+# Numba's default (workqueue) threading layer aborts if two threads launch parallel kernels at once
+_batch_lock = threading.Lock()
+
+def _below(edge: float) -> float:
+    """Largest float under edge, turning a strict upper bound into an inclusive bin edge"""
+    return np.nextafter(edge, -np.inf)
+
+# Fundamental score: (stock_info key, default, bin edges, points per bin) for each metric, binned with
+# np.searchsorted(side='left') so a value equal to an edge falls in the lower bin. Missing or zero
+# values score nothing.
+FUNDAMENTAL_SCORE_TABLE = (
+    ('pe_ratio', 0, np.array([_below(5), 20, _below(30)]), np.array([10, 20, 10, 0])),  # 20 points
+    ('profit_margins', 0, np.array([0.05, 0.15]), np.array([0, 10, 20])),  # 20 points
+    ('revenue_growth', 0, np.array([0.05, 0.15]), np.array([0, 10, 20])),  # 20 points
+    ('price_to_book', 0, np.array([_below(1.5), _below(3)]), np.array([15, 8, 0])),  # 15 points
+    ('dividend_yield', 0, np.array([0, 0.02]), np.array([0, 5, 10])),  # 10 points
+    ('beta', 1, np.array([_below(0.5), 1.2, 1.5]), np.array([8, 15, 8, 0])),  # Stability, 15 points
+)
+
+def fundamental_scores(infos: List[Dict]) -> np.ndarray:
+    """Fundamental score out of 100 for each stock_info dict, scored without per-metric branching"""
+    scores = np.zeros(len(infos))
+    for key, default, edges, points in FUNDAMENTAL_SCORE_TABLE:
+        values = np.array([info.get(key, default) or 0 for info in infos], dtype=float)
+        values = np.nan_to_num(values, nan=0.0)
+        scores += np.where(values != 0, points[np.searchsorted(edges, values)], 0)
+    return scores
+
+# Most opportunities a scan returns; the whole watchlist is scanned and only the strongest are kept
+MAX_OPPORTUNITIES = 20
+
+# Scan types that only read stock info, so no price history is fetched for them
+FUNDAMENTAL_SCANS = ("Value Stocks", "Growth Stocks")
+
+# Computed scan features kept per (symbol, first date, last date, rows, last close, last volume), so a new or
+# revised bar misses the cache
+FEATURE_CACHE_SIZE = 256
+
+class SymbolFeatures(NamedTuple):
+    """Latest-bar values the technical and momentum scans read from an indicator frame"""
+    bars: int
+    close: float
+    prev_close: float
+    close_20d_ago: float
+    volume: float
+    volume_mean_20: float
+    rsi: float
+    macd: float
+    macd_signal: float
+    prev_macd: float
+    prev_macd_signal: float
+    ma20: float
+    ma50: float
+
+# Technical Analysis tab table: row labels, value formats and readings (first condition, second condition, default)
+INDICATOR_NAMES = ['RSI', 'MACD', 'Moving Avg (20)', 'Moving Avg (50)', 'Bollinger Upper', 'Bollinger Lower']
+INDICATOR_FORMATS = ('%.2f', '%.4f', '$%.2f', '$%.2f', '$%.2f', '$%.2f')
+INDICATOR_SIGNALS = (
+    ['Oversold', 'Bullish', 'Above', 'Above', 'Approaching', 'Approaching'],
+    ['Overbought', 'Bearish', 'Below', 'Below', 'Normal', 'Normal'],
+    ['Neutral', 'Bearish', 'Below', 'Below', 'Normal', 'Normal'],
+)
+
 class OpportunityDetector:
     """Detect trading opportunities using technical, fundamental, and sentiment analysis"""
     
@@ -18,6 +95,12 @@ class OpportunityDetector:
         self.market_provider = market_data
         self.database = db
         
+        # Sector per symbol; it never changes, so technical scans skip the stock info fetch once it is known
+        self._sectors: Dict[str, str] = {}
+        
+        # SymbolFeatures shared by the scans and the Technical Analysis tab, oldest evicted first
+        self._features: Dict[tuple, SymbolFeatures] = {}
+        
         # Popular stocks for screening
         self.watchlist = [
             'AAPL', 'MSFT', 'GOOGL', 'AMZN', 'TSLA', 'META', 'NVDA', 'NFLX',
@@ -121,12 +204,9 @@ class OpportunityDetector:
         
         if symbol:
             with loading_spinner(f"Loading data for {symbol}..."):
-                stock_data = self.market_provider.get_stock_data(symbol, period="6mo")
+                technical_data, signals, indicators_df = self._technical_analysis(symbol)
             
-            if not stock_data.empty:
-                # Calculate technical indicators
-                technical_data = self._calculate_technical_indicators(stock_data)
-                
+            if not technical_data.empty:
                 col1, col2 = st.columns([2, 1])
                 
                 with col1:
@@ -136,8 +216,6 @@ class OpportunityDetector:
                 
                 with col2:
                     # Technical signals
-                    signals = self._get_technical_signals(technical_data)
-                    
                     st.markdown("#### Technical Signals")
                     for signal_name, signal_data in signals.items():
                         color = "🟢" if signal_data['signal'] == "BUY" else "🔴" if signal_data['signal'] == "SELL" else "🟡"
@@ -146,32 +224,44 @@ class OpportunityDetector:
                 
                 # Technical indicators table
                 st.markdown("#### Technical Indicators")
-                latest = technical_data.iloc[-1]
-                
-                indicators_df = pd.DataFrame({
-                    'Indicator': ['RSI', 'MACD', 'Moving Avg (20)', 'Moving Avg (50)', 'Bollinger Upper', 'Bollinger Lower'],
-                    'Value': [
-                        f"{latest['RSI']:.2f}",
-                        f"{latest['MACD']:.4f}",
-                        f"${latest['MA20']:.2f}",
-                        f"${latest['MA50']:.2f}",
-                        f"${latest['BB_upper']:.2f}",
-                        f"${latest['BB_lower']:.2f}"
-                    ],
-                    'Signal': [
-                        "Oversold" if latest['RSI'] < 30 else "Overbought" if latest['RSI'] > 70 else "Neutral",
-                        "Bullish" if latest['MACD'] > latest['MACD_signal'] else "Bearish",
-                        "Above" if latest['Close'] > latest['MA20'] else "Below",
-                        "Above" if latest['Close'] > latest['MA50'] else "Below",
-                        "Approaching" if latest['Close'] > latest['BB_upper'] * 0.98 else "Normal",
-                        "Approaching" if latest['Close'] < latest['BB_lower'] * 1.02 else "Normal"
-                    ]
-                })
-                
                 st.dataframe(indicators_df, use_container_width=True, hide_index=True)
             else:
                 st.error(f"No data found for {symbol}")
     
+    @st.cache_data(ttl=300, show_spinner=False)
+    def _technical_analysis(_self, symbol: str) -> Tuple[pd.DataFrame, Dict[str, Dict], pd.DataFrame]:
+        """Indicators, signals and indicator table for a symbol, kept across reruns"""
+        stock_data = _self.market_provider.get_stock_data(symbol, period="6mo")
+        if stock_data.empty:
+            return stock_data, {}, pd.DataFrame()
+        
+        technical_data = _self._calculate_technical_indicators(stock_data)
+        signals = _self._get_technical_signals(technical_data, symbol)
+        return technical_data, signals, _self._indicator_table(technical_data)
+    
+    def _indicator_table(self, technical_data: pd.DataFrame) -> pd.DataFrame:
+        """Latest indicator values and their reading, as shown in the Technical Analysis tab"""
+        rsi, macd, macd_signal, ma20, ma50, bb_upper, bb_lower, close = technical_data[
+            ['RSI', 'MACD', 'MACD_signal', 'MA20', 'MA50', 'BB_upper', 'BB_lower', 'Close']
+        ].to_numpy(dtype=float)[-1]
+        values = np.array([rsi, macd, ma20, ma50, bb_upper, bb_lower])
+        
+        # One row per indicator: the first matching condition picks the reading, otherwise the default
+        signals = np.select(
+            [
+                [rsi < 30, macd > macd_signal, close > ma20, close > ma50, close > bb_upper * 0.98, close < bb_lower * 1.02],
+                [rsi > 70, False, False, False, False, False],
+            ],
+            [INDICATOR_SIGNALS[0], INDICATOR_SIGNALS[1]],
+            default=INDICATOR_SIGNALS[2]
+        )
+        
+        return pd.DataFrame({
+            'Indicator': INDICATOR_NAMES,
+            'Value': [fmt % value for fmt, value in zip(INDICATOR_FORMATS, values)],
+            'Signal': signals
+        })
+    
     def _render_fundamental_analysis(self):
         """Render fundamental analysis section"""
         st.markdown("### 💰 Fundamental Analysis")
@@ -242,8 +332,9 @@ class OpportunityDetector:
             
             if news_data:
                 # Calculate overall sentiment
-                sentiments = [article.get('sentiment', 0) for article in news_data]
-                avg_sentiment = np.mean(sentiments)
+                sentiments = np.fromiter((article.get('sentiment', 0) for article in news_data),
+                                         dtype=float, count=len(news_data))
+                avg_sentiment = sentiments.mean()
                 
                 sentiment_label = "Positive" if avg_sentiment > 0.1 else "Negative" if avg_sentiment < -0.1 else "Neutral"
                 sentiment_color = "🟢" if avg_sentiment > 0.1 else "🔴" if avg_sentiment < -0.1 else "🟡"
@@ -251,8 +342,8 @@ class OpportunityDetector:
                 st.markdown(f"{sentiment_color} **Overall Sentiment: {sentiment_label}** (Score: {avg_sentiment:.3f})")
                 
                 # Sentiment distribution
-                positive_count = sum(1 for s in sentiments if s > 0.1)
-                negative_count = sum(1 for s in sentiments if s < -0.1)
+                positive_count = int((sentiments > 0.1).sum())
+                negative_count = int((sentiments < -0.1).sum())
                 neutral_count = len(sentiments) - positive_count - negative_count
                 
                 sentiment_df = pd.DataFrame({
@@ -274,7 +365,7 @@ class OpportunityDetector:
             indices_data = self.market_provider.get_market_indices()
             if 'VIX' in indices_data:
                 vix_value = indices_data['VIX']['value']
-                fear_greed_score = max(0, min(100, 100 - (vix_value - 10) * 3))
+                fear_greed_score = float(np.clip(100 - (vix_value - 10) * 3, 0, 100))
                 
                 metric_card("Fear & Greed Index", f"{fear_greed_score:.0f}")
                 metric_card("VIX Level", f"{vix_value:.2f}")
@@ -282,10 +373,10 @@ class OpportunityDetector:
         # Top sentiment movers
         st.markdown("#### Top News by Sentiment")
         if news_data:
-            # Sort by absolute sentiment score
-            sorted_news = sorted(news_data, key=lambda x: abs(x.get('sentiment', 0)), reverse=True)
+            # Sort by absolute sentiment score (stable, so ties keep feed order as before)
+            top_news = [news_data[i] for i in np.argsort(-np.abs(sentiments), kind='stable')[:5]]
             
-            for i, article in enumerate(sorted_news[:5]):
+            for i, article in enumerate(top_news):
                 with st.expander(f"#{i+1} - {article['title'][:60]}..."):
                     sentiment = article.get('sentiment', 0)
                     sentiment_emoji = "😊" if sentiment > 0.1 else "😟" if sentiment < -0.1 else "😐"
@@ -297,110 +388,228 @@ class OpportunityDetector:
     
     def _run_opportunity_scan(self, scan_type: str, filters: Dict[str, Any]) -> pd.DataFrame:
         """Run opportunity scan based on selected criteria"""
-        opportunities = []
+        # Min-heap of (signal_strength, -scan order, opportunity) holding the strongest MAX_OPPORTUNITIES
+        top = []
         
         # Filter watchlist based on market cap if specified
         symbols_to_scan = self.watchlist.copy()
         
-        for symbol in symbols_to_scan[:20]:  # Limit to 20 for demo
+        # The scan waits on the network, so fetch the symbols concurrently. Workers get this run's context,
+        # otherwise Streamlit drops the provider's st.error/st.warning calls made off the script thread
+        ctx = get_script_run_ctx()
+        with ThreadPoolExecutor(max_workers=8, initializer=add_script_run_ctx, initargs=(None, ctx)) as executor:
+            futures = {
+                symbol: executor.submit(self._fetch_symbol, symbol, scan_type)
+                for symbol in symbols_to_scan
+            }
+        
+        fetched = {}
+        for symbol, future in futures.items():
             try:
-                stock_data = self.market_provider.get_stock_data(symbol, period="3mo")
-                if stock_data.empty:
-                    continue
-                
-                # Calculate technical indicators
-                technical_data = self._calculate_technical_indicators(stock_data)
-                latest = technical_data.iloc[-1]
-                
-                # Get stock info for fundamental data
-                stock_info = self.market_provider.get_stock_info(symbol)
-                
-                # Apply scan type logic
-                opportunity = None
-                
-                if scan_type == "Technical Signals":
-                    opportunity = self._scan_technical_signals(symbol, technical_data, stock_info)
-                elif scan_type == "Value Stocks":
-                    opportunity = self._scan_value_stocks(symbol, stock_info)
-                elif scan_type == "Growth Stocks":
-                    opportunity = self._scan_growth_stocks(symbol, stock_info)
-                elif scan_type == "Momentum Stocks":
-                    opportunity = self._scan_momentum_stocks(symbol, technical_data, stock_info)
-                
-                if opportunity and opportunity['signal_strength'] >= filters.get('min_signal_strength', 0.5):
-                    opportunities.append(opportunity)
-            
+                stock_data, stock_info = future.result()
             except Exception as e:
                 st.warning(f"Error scanning {symbol}: {e}")
                 continue
+            
+            # Fundamental scans only read stock info, the others only read price history
+            has_data = bool(stock_info) if scan_type in FUNDAMENTAL_SCANS else not stock_data.empty
+            if has_data:
+                fetched[symbol] = (stock_data, stock_info)
         
-        return pd.DataFrame(opportunities)
+        # Indicators for every fetched symbol in one batched pass
+        technical = {}
+        if scan_type not in FUNDAMENTAL_SCANS:
+            technical = self._batch_technical_indicators({symbol: data for symbol, (data, _) in fetched.items()})
+        
+        for order, (symbol, (stock_data, stock_info)) in enumerate(fetched.items()):
+            try:
+                opportunity = self._scan_symbol(symbol, scan_type, technical.get(symbol), stock_info)
+            except Exception as e:
+                st.warning(f"Error scanning {symbol}: {e}")
+                continue
+            
+            if opportunity and opportunity['signal_strength'] >= filters.get('min_signal_strength', 0.5):
+                entry = (opportunity['signal_strength'], -order, opportunity)
+                if len(top) < MAX_OPPORTUNITIES:
+                    heapq.heappush(top, entry)
+                else:
+                    heapq.heappushpop(top, entry)
+        
+        # Strongest first, equal strengths in watchlist order; every opportunity of a scan type has the same keys,
+        # so the frame is built from one list per column
+        columns = defaultdict(list)
+        for _, _, opportunity in sorted(top, reverse=True):
+            for key, value in opportunity.items():
+                columns[key].append(value)
+        return pd.DataFrame(columns)
+    
+    def _fetch_symbol(self, symbol: str, scan_type: str) -> Tuple[pd.DataFrame, Dict]:
+        """Price history and stock info for one symbol, skipping whichever the scan type does not read"""
+        if scan_type in FUNDAMENTAL_SCANS:
+            stock_data = pd.DataFrame()
+        else:
+            stock_data = self.market_provider.get_stock_data(symbol, period="3mo")
+            if stock_data.empty or symbol in self._sectors:
+                return stock_data, {}
+        
+        stock_info = self.market_provider.get_stock_info(symbol)
+        if stock_info:
+            self._sectors[symbol] = stock_info.get('sector', 'Unknown')
+        return stock_data, stock_info
+    
+    def _scan_symbol(self, symbol: str, scan_type: str, technical_data: Optional[pd.DataFrame],
+                     stock_info: Dict) -> Optional[Dict]:
+        """Apply the scan type logic to one symbol"""
+        if scan_type == "Technical Signals":
+            return self._scan_technical_signals(symbol, self._symbol_features(technical_data, symbol),
+                                                self._sectors.get(symbol, 'Unknown'))
+        elif scan_type == "Value Stocks":
+            return self._scan_value_stocks(symbol, stock_info)
+        elif scan_type == "Growth Stocks":
+            return self._scan_growth_stocks(symbol, stock_info)
+        elif scan_type == "Momentum Stocks":
+            return self._scan_momentum_stocks(symbol, self._symbol_features(technical_data, symbol),
+                                              self._sectors.get(symbol, 'Unknown'))
+        return None
+    
+    def _build_price_matrix(self, frames: Dict[str, pd.DataFrame]) -> Tuple[np.ndarray, np.ndarray]:
+        """Stack closes and volumes into (n_symbols, n_days) matrices, left-padding shorter histories with NaN"""
+        n_days = max(len(data) for data in frames.values())
+        # float32 halves the memory traffic, and the signals only compare against coarse thresholds
+        closes = np.full((len(frames), n_days), np.nan, dtype=np.float32)
+        volumes = np.full((len(frames), n_days), np.nan, dtype=np.float32)
+        
+        for row, data in enumerate(frames.values()):
+            closes[row, n_days - len(data):] = data['Close'].to_numpy(dtype=np.float32)
+            volumes[row, n_days - len(data):] = data['Volume'].to_numpy(dtype=np.float32)
+        
+        return closes, volumes
+    
+    def _batch_technical_indicators(self, frames: Dict[str, pd.DataFrame]) -> Dict[str, pd.DataFrame]:
+        """Technical indicators for many symbols at once, returned as one frame per symbol"""
+        if not frames:
+            return {}
+        
+        closes, volumes = self._build_price_matrix(frames)
+        with _batch_lock:
+            values = batch_indicators(closes, volumes)
+        n_days = closes.shape[1]
+        
+        return {
+            symbol: data.assign(**{
+                column: values[i, row, n_days - len(data):] for i, column in enumerate(BATCH_COLUMNS)
+            })
+            for row, (symbol, data) in enumerate(frames.items())
+        }
     
     def _calculate_technical_indicators(self, data: pd.DataFrame) -> pd.DataFrame:
         """Calculate technical indicators for the stock data"""
-        df = data.copy()
+        # Only new columns are added, so they are collected here and attached without copying the prices
+        indicators = {}
         
+        close_values = data['Close'].to_numpy(dtype=np.float64)
         # Moving averages
-        df['MA20'] = ta.trend.sma_indicator(df['Close'], window=20)
-        df['MA50'] = ta.trend.sma_indicator(df['Close'], window=50)
+        if TALIB_AVAILABLE:
+            indicators['MA20'] = talib.SMA(close_values, timeperiod=20)
+            indicators['MA50'] = talib.SMA(close_values, timeperiod=50)
+        else:
+            indicators['MA20'] = rolling_mean_recurrence(close_values, 20)
+            indicators['MA50'] = rolling_mean_recurrence(close_values, 50)
         
-        # RSI
-        df['RSI'] = ta.momentum.rsi(df['Close'], window=14)
+        # RSI from the scanner's kernel, so this tab shows the RSI its thresholds use
+        # (TA-Lib's RSI seeds Wilder smoothing with an SMA and gives different values)
+        indicators['RSI'] = self._calculate_rsi(data, window=14)
         
         # MACD
-        macd = ta.trend.MACD(df['Close'])
-        df['MACD'] = macd.macd()
-        df['MACD_signal'] = macd.macd_signal()
-        df['MACD_hist'] = macd.macd_diff()
+        indicators['MACD'], indicators['MACD_signal'], indicators['MACD_hist'] = macd_lines(close_values)
         
         # Bollinger Bands
-        bb = ta.volatility.BollingerBands(df['Close'])
-        df['BB_upper'] = bb.bollinger_hband()
-        df['BB_lower'] = bb.bollinger_lband()
-        df['BB_middle'] = bb.bollinger_mavg()
+        bb_middle, indicators['BB_upper'], indicators['BB_lower'] = bollinger_bands(close_values)
+        indicators['BB_middle'] = bb_middle
         
         # Volume indicators
-        df['Volume_SMA'] = df['Volume'].rolling(window=20).mean()
+        indicators['Volume_SMA'] = rolling_mean_recurrence(data['Volume'].to_numpy(dtype=np.float64), 20)
         
-        return df
+        return data.assign(**indicators)
     
-    def _get_technical_signals(self, data: pd.DataFrame) -> Dict[str, Dict]:
+    def _calculate_rsi(self, data: pd.DataFrame, window: int = 14) -> pd.Series:
+        """Calculate Wilder RSI (EMA of gains and losses with alpha = 1/window)"""
+        return pd.Series(wilder_rsi(data['Close'].to_numpy(dtype=np.float64), window), index=data.index)
+    
+    def _symbol_features(self, data: pd.DataFrame, symbol: Optional[str] = None) -> SymbolFeatures:
+        """Latest-bar features for an indicator frame, computed once per symbol and frame"""
+        key = None
+        if symbol is not None and 'Date' in data.columns:
+            # The last bar can be revised intraday, so its close and volume are part of the key
+            key = (symbol, data['Date'].iat[0], data['Date'].iat[-1], len(data),
+                   data['Close'].iat[-1], data['Volume'].iat[-1])
+        features = self._features.get(key) if key is not None else None
+        if features is not None:
+            return features
+        
+        close = data['Close'].to_numpy()
+        volume = data['Volume'].to_numpy()
+        macd = data['MACD'].to_numpy()
+        macd_signal = data['MACD_signal'].to_numpy()
+        features = SymbolFeatures(
+            bars=len(data),
+            close=close[-1],
+            prev_close=close[-2] if len(data) >= 2 else np.nan,
+            close_20d_ago=close[-20] if len(data) >= 20 else np.nan,
+            volume=volume[-1],
+            volume_mean_20=volume[-20:].mean(),
+            rsi=data['RSI'].to_numpy()[-1],
+            macd=macd[-1],
+            macd_signal=macd_signal[-1],
+            prev_macd=macd[-2] if len(data) >= 2 else np.nan,
+            prev_macd_signal=macd_signal[-2] if len(data) >= 2 else np.nan,
+            ma20=data['MA20'].to_numpy()[-1],
+            ma50=data['MA50'].to_numpy()[-1]
+        )
+        
+        if key is not None:
+            if len(self._features) >= FEATURE_CACHE_SIZE:
+                self._features.pop(next(iter(self._features)), None)
+            self._features[key] = features
+        return features
+    
+    def _get_technical_signals(self, data: pd.DataFrame, symbol: Optional[str] = None) -> Dict[str, Dict]:
         """Get technical signals from the data"""
-        latest = data.iloc[-1]
-        previous = data.iloc[-2]
-        
+        return self._feature_signals(self._symbol_features(data, symbol))
+    
+    def _feature_signals(self, features: SymbolFeatures) -> Dict[str, Dict]:
+        """Technical signals from the latest-bar features"""
         signals = {}
         
         # RSI Signal
-        if latest['RSI'] < 30:
-            signals['RSI'] = {'signal': 'BUY', 'strength': (30 - latest['RSI']) / 30}
-        elif latest['RSI'] > 70:
-            signals['RSI'] = {'signal': 'SELL', 'strength': (latest['RSI'] - 70) / 30}
+        if features.rsi < 30:
+            signals['RSI'] = {'signal': 'BUY', 'strength': (30 - features.rsi) / 30}
+        elif features.rsi > 70:
+            signals['RSI'] = {'signal': 'SELL', 'strength': (features.rsi - 70) / 30}
         else:
             signals['RSI'] = {'signal': 'NEUTRAL', 'strength': 0.5}
         
         # MACD Signal
-        if latest['MACD'] > latest['MACD_signal'] and previous['MACD'] <= previous['MACD_signal']:
+        if features.macd > features.macd_signal and features.prev_macd <= features.prev_macd_signal:
             signals['MACD'] = {'signal': 'BUY', 'strength': 0.8}
-        elif latest['MACD'] < latest['MACD_signal'] and previous['MACD'] >= previous['MACD_signal']:
+        elif features.macd < features.macd_signal and features.prev_macd >= features.prev_macd_signal:
             signals['MACD'] = {'signal': 'SELL', 'strength': 0.8}
         else:
             signals['MACD'] = {'signal': 'NEUTRAL', 'strength': 0.5}
         
         # Moving Average Signal
-        if latest['Close'] > latest['MA20'] > latest['MA50']:
+        if features.close > features.ma20 > features.ma50:
             signals['Moving Average'] = {'signal': 'BUY', 'strength': 0.7}
-        elif latest['Close'] < latest['MA20'] < latest['MA50']:
+        elif features.close < features.ma20 < features.ma50:
             signals['Moving Average'] = {'signal': 'SELL', 'strength': 0.7}
         else:
             signals['Moving Average'] = {'signal': 'NEUTRAL', 'strength': 0.5}
         
         return signals
     
-    def _scan_technical_signals(self, symbol: str, data: pd.DataFrame, stock_info: Dict) -> Optional[Dict]:
+    def _scan_technical_signals(self, symbol: str, features: SymbolFeatures, sector: str) -> Optional[Dict]:
         """Scan for technical signals"""
-        signals = self._get_technical_signals(data)
-        latest = data.iloc[-1]
+        signals = self._feature_signals(features)
         
         # Calculate overall signal strength
         buy_signals = sum(1 for s in signals.values() if s['signal'] == 'BUY')
@@ -412,11 +621,11 @@ class OpportunityDetector:
                 'symbol': symbol,
                 'strategy': 'Technical',
                 'signal_strength': signal_strength,
-                'price': latest['Close'],
-                'change_pct': ((latest['Close'] - data.iloc[-2]['Close']) / data.iloc[-2]['Close']) * 100,
-                'volume': latest['Volume'],
+                'price': features.close,
+                'change_pct': ((features.close - features.prev_close) / features.prev_close) * 100,
+                'volume': features.volume,
                 'date': datetime.now(),
-                'sector': stock_info.get('sector', 'Unknown'),
+                'sector': sector,
                 'potential_gain': 15.0  # Estimated
             }
         
@@ -471,16 +680,13 @@ class OpportunityDetector:
         
         return None
     
-    def _scan_momentum_stocks(self, symbol: str, data: pd.DataFrame, stock_info: Dict) -> Optional[Dict]:
+    def _scan_momentum_stocks(self, symbol: str, features: SymbolFeatures, sector: str) -> Optional[Dict]:
         """Scan for momentum stocks"""
-        if len(data) < 20:
+        if features.bars < 20:
             return None
         
-        latest = data.iloc[-1]
-        twenty_days_ago = data.iloc[-20]
-        
-        price_momentum = ((latest['Close'] - twenty_days_ago['Close']) / twenty_days_ago['Close']) * 100
-        volume_momentum = latest['Volume'] / data['Volume'].tail(20).mean()
+        price_momentum = ((features.close - features.close_20d_ago) / features.close_20d_ago) * 100
+        volume_momentum = features.volume / features.volume_mean_20
         
         if price_momentum > 10 and volume_momentum > 1.2:
             signal_strength = min(price_momentum / 20, 1) * 0.7 + min(volume_momentum / 2, 1) * 0.3
@@ -489,11 +695,11 @@ class OpportunityDetector:
                 'symbol': symbol,
                 'strategy': 'Momentum',
                 'signal_strength': max(0.5, signal_strength),
-                'price': latest['Close'],
+                'price': features.close,
                 'change_pct': price_momentum,
-                'volume': latest['Volume'],
+                'volume': features.volume,
                 'date': datetime.now(),
-                'sector': stock_info.get('sector', 'Unknown'),
+                'sector': sector,
                 'momentum_20d': price_momentum,
                 'volume_ratio': volume_momentum,
                 'potential_gain': 18.0
@@ -503,51 +709,7 @@ class OpportunityDetector:
     
     def _calculate_fundamental_score(self, stock_info: Dict) -> float:
         """Calculate fundamental score out of 100"""
-        score = 0
-        
-        # P/E Ratio (20 points)
-        pe_ratio = stock_info.get('pe_ratio', 0)
-        if pe_ratio and 5 <= pe_ratio <= 20:
-            score += 20
-        elif pe_ratio and pe_ratio < 30:
-            score += 10
-        
-        # Profit Margin (20 points)
-        profit_margin = stock_info.get('profit_margins', 0)
-        if profit_margin and profit_margin > 0.15:
-            score += 20
-        elif profit_margin and profit_margin > 0.05:
-            score += 10
-        
-        # Revenue Growth (20 points)
-        revenue_growth = stock_info.get('revenue_growth', 0)
-        if revenue_growth and revenue_growth > 0.15:
-            score += 20
-        elif revenue_growth and revenue_growth > 0.05:
-            score += 10
-        
-        # Price to Book (15 points)
-        pb_ratio = stock_info.get('price_to_book', 0)
-        if pb_ratio and pb_ratio < 1.5:
-            score += 15
-        elif pb_ratio and pb_ratio < 3:
-            score += 8
-        
-        # Dividend Yield (10 points)
-        div_yield = stock_info.get('dividend_yield', 0)
-        if div_yield and div_yield > 0.02:
-            score += 10
-        elif div_yield and div_yield > 0:
-            score += 5
-        
-        # Beta (stability) (15 points)
-        beta = stock_info.get('beta', 1)
-        if beta and 0.5 <= beta <= 1.2:
-            score += 15
-        elif beta and beta <= 1.5:
-            score += 8
-        
-        return score
+        return float(fundamental_scores([stock_info])[0])
     
     def _generate_investment_thesis(self, stock_info: Dict) -> str:
         """Generate simple investment thesis"""
@@ -578,13 +740,19 @@ class OpportunityDetector:
     def _save_opportunities_to_db(self, opportunities: pd.DataFrame):
         """Save opportunities to database"""
         try:
-            for _, opportunity in opportunities.iterrows():
-                self.database.save_opportunity(opportunity.to_dict())
-            st.success(f"Saved {len(opportunities)} opportunities to database!")
+            if self.database.save_opportunities(opportunities.to_dict('records')):
+                st.success(f"Saved {len(opportunities)} opportunities to database!")
         except Exception as e:
             st.error(f"Error saving to database: {e}")
 
+@st.cache_resource
+def get_detector() -> OpportunityDetector:
+    """Shared detector instance that survives Streamlit reruns"""
+    # Compile the indicator kernels once per process rather than during the first scan
+    warm_up()
+    return OpportunityDetector()
+
 # For testing purposes
 if __name__ == "__main__":
-    detector = OpportunityDetector()
+    detector = get_detector()
     detector.render() 
\ No newline at end of file
@@ -2,20 +2,51 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from src.data.market_data import market_data
 from src.data.database import db
+from src.utils.jit import njit
 from src.ui.components import (
     metric_card, create_portfolio_pie_chart, create_performance_chart,
     display_trades_table, loading_spinner, format_currency, format_percentage
 )
 
+@njit(cache=True)
+def reduce_trades(symbol_ids: np.ndarray, signed_quantity: np.ndarray, price: np.ndarray,
+                  n_symbols: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Net quantity and average cost per symbol id, applying trades oldest first"""
+    quantity = np.zeros(n_symbols)
+    avg_cost = np.zeros(n_symbols)
+    for i in range(symbol_ids.size):
+        if signed_quantity[i] == 0:
+            continue  # Nothing traded, and the blend below would divide by zero
+        
+        symbol = symbol_ids[i]
+        held = quantity[symbol]
+        new_quantity = held + signed_quantity[i]
+        
+        if held == 0 or (held > 0) == (signed_quantity[i] > 0):
+            # Opening or adding to a position blends the trade price into the average
+            avg_cost[symbol] = (held * avg_cost[symbol] + signed_quantity[i] * price[i]) / new_quantity
+        elif new_quantity == 0:
+            avg_cost[symbol] = 0.0
+        elif (new_quantity > 0) != (held > 0):
+            # Trading through zero opens the remainder at the trade price
+            avg_cost[symbol] = price[i]
+        # Reducing a position keeps its average cost (the difference is realized P&L)
+        
+        quantity[symbol] = new_quantity
+    return quantity, avg_cost
+
 class PortfolioManager:
     """Portfolio management with trade logging, position tracking, and performance analytics"""
     
     def __init__(self):
         self.market_provider = market_data
         self.database = db
+        # Connect up front: connecting lazily inside a cached loader below would capture the connection
+        # warning in its cache entry and replay it on every cache hit
+        self.database.ensure_connected()
     
     def render(self):
         """Render the portfolio management dashboard"""
@@ -55,6 +86,15 @@ class PortfolioManager:
         portfolio_value = self._calculate_portfolio_value(positions)
         performance_data = self._get_performance_data()
         
+        # Long and short counts from one pass over the quantities
+        signs = np.sign(positions['quantity'].to_numpy()) if not positions.empty else np.zeros(0)
+        long_positions = int((signs > 0).sum())
+        short_positions = int((signs < 0).sum())
+        
+        if portfolio_value['unpriced']:
+            st.warning(f"⚠️ No current price for {', '.join(portfolio_value['unpriced'])}; "
+                       "these positions are left out of the totals below.")
+        
         # Key metrics
         col1, col2, col3, col4, col5 = st.columns(5)
         
@@ -81,8 +121,7 @@ class PortfolioManager:
             )
         
         with col4:
-            num_positions = len(positions[positions['quantity'] != 0]) if not positions.empty else 0
-            metric_card("Active Positions", str(num_positions))
+            metric_card("Active Positions", str(long_positions + short_positions))
         
         with col5:
             if not performance_data.empty:
@@ -95,14 +134,9 @@ class PortfolioManager:
         col1, col2 = st.columns([2, 1])
         with col1:
             if not positions.empty and portfolio_value['total_value'] > 0:
-                # Add market values for pie chart
-                positions_with_values = positions.copy()
-                for idx, position in positions_with_values.iterrows():
-                    if position['quantity'] != 0:
-                        current_price = self._get_current_price(position['symbol'])
-                        positions_with_values.loc[idx, 'market_value'] = abs(position['quantity']) * current_price
-                
-                fig = create_portfolio_pie_chart(positions_with_values[positions_with_values['quantity'] != 0])
+                # Pie slices are sized by absolute market value, so shorts count too
+                valued = self._value_positions(positions).dropna(subset=['market_value'])
+                fig = create_portfolio_pie_chart(valued.assign(market_value=valued['market_value'].abs()))
                 st.plotly_chart(fig, use_container_width=True)
             else:
                 st.info("No positions to display. Start by adding some trades!")
@@ -111,9 +145,6 @@ class PortfolioManager:
             # Portfolio statistics
             st.markdown("#### Portfolio Stats")
             if not positions.empty:
-                long_positions = len(positions[positions['quantity'] > 0])
-                short_positions = len(positions[positions['quantity'] < 0])
-                
                 metric_card("Long Positions", str(long_positions))
                 metric_card("Short Positions", str(short_positions))
                 
@@ -129,42 +160,32 @@ class PortfolioManager:
         
         if not positions.empty and len(positions[positions['quantity'] != 0]) > 0:
             # Enhance positions data with current prices and P&L
-            enhanced_positions = []
-            
-            for _, position in positions.iterrows():
-                if position['quantity'] == 0:
-                    continue
-                
-                current_price = self._get_current_price(position['symbol'])
-                market_value = position['quantity'] * current_price
-                cost_basis = position['quantity'] * position['avg_cost']
-                pnl = market_value - cost_basis
-                pnl_percent = (pnl / abs(cost_basis)) * 100 if cost_basis != 0 else 0
-                
-                enhanced_positions.append({
-                    'Symbol': position['symbol'],
-                    'Quantity': f"{position['quantity']:,.0f}",
-                    'Avg Cost': f"${position['avg_cost']:.2f}",
-                    'Current Price': f"${current_price:.2f}",
-                    'Market Value': f"${market_value:,.2f}",
-                    'P&L': f"${pnl:,.2f}",
-                    'P&L %': f"{pnl_percent:+.2f}%",
-                    'Position Type': 'Long' if position['quantity'] > 0 else 'Short'
-                })
-            
-            if enhanced_positions:
-                positions_df = pd.DataFrame(enhanced_positions)
-                
-                # Style the dataframe
-                def color_pnl(val):
-                    if 'P&L' in val.name:
-                        if val.startswith('$-') or val.startswith('-'):
-                            return 'background-color: #fee2e2'
-                        elif val.startswith('$') and not val.startswith('$-'):
-                            return 'background-color: #dcfce7'
-                    return ''
+            valued = self._value_positions(positions)
+            pnl = valued['pnl']
+            pnl_percent = valued['pnl_percent']
+            
+            positions_df = pd.DataFrame({
+                'Symbol': valued['symbol'],
+                'Quantity': valued['quantity'].map('{:,.0f}'.format),
+                'Avg Cost': valued['avg_cost'].map('${:.2f}'.format),
+                # Unpriced positions read N/A instead of a misleading $0.00 and -100%
+                'Current Price': valued['current_price'].map('${:.2f}'.format, na_action='ignore').fillna('N/A'),
+                'Market Value': valued['market_value'].map('${:,.2f}'.format, na_action='ignore').fillna('N/A'),
+                'P&L': pnl.map('${:,.2f}'.format, na_action='ignore').fillna('N/A'),
+                'P&L %': pnl_percent.map('{:+.2f}%'.format, na_action='ignore').fillna('N/A'),
+                'Position Type': np.where(valued['quantity'] > 0, 'Long', 'Short')
+            })
+            
+            if not positions_df.empty:
+                # Style the dataframe by the sign of the numeric P&L behind each formatted column
+                def color_by_sign(values: pd.Series) -> np.ndarray:
+                    values = values.to_numpy()
+                    return np.where(values < 0, 'background-color: #fee2e2',
+                                    np.where(values > 0, 'background-color: #dcfce7', ''))
                 
-                styled_df = positions_df.style.applymap(color_pnl, subset=['P&L', 'P&L %'])
+                styled_df = (positions_df.style
+                             .apply(lambda _: color_by_sign(pnl), subset=['P&L'])
+                             .apply(lambda _: color_by_sign(pnl_percent), subset=['P&L %']))
                 st.dataframe(styled_df, use_container_width=True, hide_index=True)
                 
                 # Position actions
@@ -254,6 +275,11 @@ class PortfolioManager:
         performance_data = self._get_performance_data()
         
         if not performance_data.empty:
+            # Daily return statistics shared by the metrics below (sample std, as pandas computes it)
+            daily_returns = performance_data['daily_return'].dropna().to_numpy()
+            mean_return = daily_returns.mean() if daily_returns.size > 0 else np.nan
+            std_return = daily_returns.std(ddof=1) if daily_returns.size > 1 else np.nan
+            
             # Performance chart
             fig = create_performance_chart(performance_data)
             st.plotly_chart(fig, use_container_width=True)
@@ -274,9 +300,8 @@ class PortfolioManager:
             
             with col3:
                 if len(performance_data) > 1:
-                    daily_returns = performance_data['daily_return'].dropna()
-                    if len(daily_returns) > 0:
-                        sharpe_ratio = (daily_returns.mean() / daily_returns.std()) * np.sqrt(252) if daily_returns.std() > 0 else 0
+                    if daily_returns.size > 0:
+                        sharpe_ratio = (mean_return / std_return) * np.sqrt(252) if std_return > 0 else 0
                         metric_card("Sharpe Ratio", f"{sharpe_ratio:.2f}")
                     else:
                         metric_card("Sharpe Ratio", "N/A")
@@ -285,9 +310,9 @@ class PortfolioManager:
             
             with col4:
                 if len(performance_data) > 1:
-                    cumulative_returns = (performance_data['total_value'] / performance_data['total_value'].iloc[0]) - 1
-                    running_max = cumulative_returns.expanding().max()
-                    drawdown = cumulative_returns - running_max
+                    values = performance_data['total_value'].to_numpy(dtype=float)
+                    cumulative_returns = values / values[0] - 1
+                    drawdown = cumulative_returns - np.maximum.accumulate(cumulative_returns)
                     max_drawdown = drawdown.min() * 100
                     metric_card("Max Drawdown", f"{max_drawdown:.2f}%")
                 else:
@@ -303,11 +328,9 @@ class PortfolioManager:
             # Risk metrics
             st.markdown("#### Risk Metrics")
             if len(performance_data) > 1:
-                daily_returns = performance_data['daily_return'].dropna()
-                
                 col1, col2, col3 = st.columns(3)
                 with col1:
-                    volatility = daily_returns.std() * np.sqrt(252) * 100
+                    volatility = std_return * np.sqrt(252) * 100
                     metric_card("Volatility (Annual)", f"{volatility:.2f}%")
                 
                 with col2:
@@ -315,9 +338,7 @@ class PortfolioManager:
                     metric_card("VaR (95%)", f"{var_95:.2f}%")
                 
                 with col3:
-                    positive_days = (daily_returns > 0).sum()
-                    total_days = len(daily_returns)
-                    win_rate = (positive_days / total_days) * 100 if total_days > 0 else 0
+                    win_rate = (daily_returns > 0).mean() * 100 if daily_returns.size > 0 else 0
                     metric_card("Win Rate", f"{win_rate:.1f}%")
         else:
             st.info("No performance data available. Start trading to see performance analytics!")
@@ -366,16 +387,17 @@ class PortfolioManager:
                 if st.checkbox("I understand this will delete all portfolio data"):
                     self._clear_portfolio_data()
     
-    def _get_current_positions(self) -> pd.DataFrame:
+    @st.cache_data(ttl=30, show_spinner=False)  # One query per rerun; cleared by _invalidate_caches
+    def _get_current_positions(_self) -> pd.DataFrame:
         """Get current portfolio positions"""
         # Try to get from database first
-        positions = self.database.get_positions()
+        positions = _self.database.get_positions()
         
         if positions.empty:
             # If no positions in database, calculate from trades
-            trades = self._get_all_trades()
+            trades = _self._get_all_trades()
             if not trades.empty:
-                positions = self._calculate_positions_from_trades(trades)
+                positions = _self._calculate_positions_from_trades(trades)
         
         return positions
     
@@ -386,20 +408,15 @@ class PortfolioManager:
                 'total_value': 0,
                 'total_cost': 0,
                 'total_pnl': 0,
-                'total_pnl_percent': 0
+                'total_pnl_percent': 0,
+                'unpriced': []
             }
         
-        total_value = 0
-        total_cost = 0
-        
-        for _, position in positions.iterrows():
-            if position['quantity'] != 0:
-                current_price = self._get_current_price(position['symbol'])
-                market_value = position['quantity'] * current_price
-                cost_basis = position['quantity'] * position['avg_cost']
-                
-                total_value += market_value
-                total_cost += cost_basis
+        # Positions without a quote are left out of the totals rather than valued at zero
+        valued = self._value_positions(positions)
+        priced = valued[valued['current_price'].notna()]
+        total_value = float(priced['market_value'].to_numpy(dtype=float).sum())
+        total_cost = float(priced['cost_basis'].to_numpy(dtype=float).sum())
         
         total_pnl = total_value - total_cost
         total_pnl_percent = (total_pnl / total_cost) * 100 if total_cost != 0 else 0
@@ -408,18 +425,37 @@ class PortfolioManager:
             'total_value': total_value,
             'total_cost': total_cost,
             'total_pnl': total_pnl,
-            'total_pnl_percent': total_pnl_percent
+            'total_pnl_percent': total_pnl_percent,
+            'unpriced': valued.loc[valued['current_price'].isna(), 'symbol'].tolist()
         }
     
     def _get_current_price(self, symbol: str) -> float:
-        """Get current price for a symbol"""
-        try:
-            stock_data = self.market_provider.get_stock_data(symbol, period="1d")
-            if not stock_data.empty:
-                return stock_data['Close'].iloc[-1]
-        except:
-            pass
-        return 0.0
+        """Get current price for a symbol, NaN if no quote is available"""
+        return float(self._get_current_prices([symbol]).iloc[0])
+    
+    @st.cache_data(ttl=60, show_spinner=False)  # Keyed on the positions' contents, so unchanged positions reuse it
+    def _value_positions(_self, positions: pd.DataFrame) -> pd.DataFrame:
+        """Active positions with current price, market value, cost basis and P&L (NaN when a position has no quote)"""
+        active = positions[positions['quantity'] != 0]
+        quantity = active['quantity'].to_numpy(dtype=float)
+        current_price = active['symbol'].map(_self._get_current_prices(active['symbol'].tolist())).to_numpy(dtype=float)
+        market_value = quantity * current_price
+        cost_basis = quantity * active['avg_cost'].to_numpy(dtype=float)
+        pnl = market_value - cost_basis
+        pnl_percent = np.divide(pnl, np.abs(cost_basis), out=np.zeros(len(active)), where=cost_basis != 0) * 100
+        
+        return active.assign(current_price=current_price, market_value=market_value, cost_basis=cost_basis,
+                             pnl=pnl, pnl_percent=pnl_percent)
+    
+    def _get_current_prices(self, symbols: List[str]) -> pd.Series:
+        """Get current prices for several symbols in one batched request, NaN for symbols without a quote"""
+        # Sorted and de-duplicated so every caller in a render shares one cached request
+        symbols = sorted(set(symbols))
+        if not symbols:
+            return pd.Series(dtype=float)
+        
+        # Quotes are cached for a minute, matching the positions valued from them
+        return self.market_provider.get_latest_prices(symbols).reindex(symbols)
     
     def _log_trade(self, symbol: str, side: str, quantity: int, price: float, 
                    trade_date: datetime.date, trade_time: datetime.time, notes: str):
@@ -442,6 +478,7 @@ class PortfolioManager:
             
             # Update positions
             self._update_position_from_trade(symbol, side, quantity, price)
+            self._invalidate_caches()
             
             # Rerun to refresh data
             st.rerun()
@@ -473,13 +510,21 @@ class PortfolioManager:
             new_qty = current_qty - quantity
             new_avg_cost = current_avg_cost  # Keep same average cost for sells
         
-        # Calculate P&L
+        # Calculate P&L, marking to the trade price when there is no quote
         current_price = self._get_current_price(symbol)
+        if np.isnan(current_price):
+            current_price = price
         pnl = (new_qty * current_price) - (new_qty * new_avg_cost) if new_qty != 0 else 0
         
         # Update database
         self.database.update_position(symbol, new_qty, new_avg_cost, pnl)
     
+    def _invalidate_caches(self):
+        """Drop every cached read that depends on trades or positions after a write"""
+        self._get_current_positions.clear()
+        self._get_performance_data.clear()
+        self._value_positions.clear()
+    
     def _get_recent_trades(self, limit: int = 20) -> pd.DataFrame:
         """Get recent trades"""
         trades = self.database.get_trades()
@@ -489,9 +534,10 @@ class PortfolioManager:
         """Get all trades"""
         return self.database.get_trades()
     
-    def _get_performance_data(self) -> pd.DataFrame:
+    @st.cache_data(ttl=30, show_spinner=False)
+    def _get_performance_data(_self) -> pd.DataFrame:
         """Get portfolio performance data"""
-        performance = self.database.get_portfolio_performance()
+        performance = _self.database.get_portfolio_performance()
         
         if not performance.empty:
             # Calculate daily returns
@@ -504,33 +550,22 @@ class PortfolioManager:
         if trades.empty:
             return pd.DataFrame()
         
-        positions = {}
-        
-        for _, trade in trades.iterrows():
-            symbol = trade['symbol']
-            if symbol not in positions:
-                positions[symbol] = {'quantity': 0, 'total_cost': 0}
-            
-            if trade['side'] == 'BUY':
-                positions[symbol]['quantity'] += trade['quantity']
-                positions[symbol]['total_cost'] += trade['total_value']
-            else:  # SELL
-                positions[symbol]['quantity'] -= trade['quantity']
-                # For sells, we don't change total_cost (realized P&L)
-        
-        # Convert to DataFrame
-        position_list = []
-        for symbol, data in positions.items():
-            if data['quantity'] != 0:
-                avg_cost = data['total_cost'] / data['quantity'] if data['quantity'] > 0 else 0
-                position_list.append({
-                    'symbol': symbol,
-                    'quantity': data['quantity'],
-                    'avg_cost': avg_cost,
-                    'pnl': 0  # Will be calculated when needed
-                })
-        
-        return pd.DataFrame(position_list)
+        # Trades come newest first; average cost depends on the order they were made in
+        if 'timestamp' in trades.columns:
+            trades = trades.sort_values('timestamp', kind='stable')
+        
+        symbol_ids, symbols = pd.factorize(trades['symbol'])
+        trade_quantity = trades['quantity'].to_numpy(dtype=float)
+        signed_quantity = np.where(trades['side'].to_numpy() == 'BUY', trade_quantity, -trade_quantity)
+        quantity, avg_cost = reduce_trades(symbol_ids, signed_quantity, trades['price'].to_numpy(dtype=float), len(symbols))
+        
+        active = quantity != 0
+        return pd.DataFrame({
+            'symbol': symbols[active],
+            'quantity': quantity[active],
+            'avg_cost': avg_cost[active],
+            'pnl': 0  # Will be calculated when needed
+        })
     
     def _save_portfolio_settings(self, initial_capital: float, benchmark: str, risk_tolerance: str):
         """Save portfolio settings"""
@@ -555,6 +590,7 @@ class PortfolioManager:
     def _clear_portfolio_data(self):
         """Clear all portfolio data"""
         # In a real implementation, this would clear database
+        self._invalidate_caches()
         st.warning("🗑️ Portfolio data cleared!")
     
     def _close_position(self, symbol: str):
@@ -565,6 +601,9 @@ class PortfolioManager:
         if not position.empty:
             current_qty = position.iloc[0]['quantity']
             current_price = self._get_current_price(symbol)
+            if np.isnan(current_price):
+                st.error(f"❌ No current price for {symbol}; the position was not closed.")
+                return
             
             if current_qty > 0:
                 side = 'SELL'
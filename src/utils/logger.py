@@ -62,56 +62,63 @@ class HedgeLabLogger:
         
         return logger
     
-    def debug(self, message: str):
+    def debug(self, message: str, *args):
         """Log debug message"""
-        self.logger.debug(message)
+        self.logger.debug(message, *args)
     
-    def info(self, message: str):
+    def info(self, message: str, *args):
         """Log info message"""
-        self.logger.info(message)
+        self.logger.info(message, *args)
     
-    def warning(self, message: str):
+    def warning(self, message: str, *args):
         """Log warning message"""
-        self.logger.warning(message)
+        self.logger.warning(message, *args)
     
-    def error(self, message: str):
+    def error(self, message: str, *args):
         """Log error message"""
-        self.logger.error(message)
+        self.logger.error(message, *args)
     
-    def critical(self, message: str):
+    def critical(self, message: str, *args):
         """Log critical message"""
-        self.logger.critical(message)
+        self.logger.critical(message, *args)
     
     def api_call(self, endpoint: str, status: str, response_time: float = None, error: str = None):
         """Log API call details"""
-        message = f"API_CALL - {endpoint} - {status}"
+        message = "API_CALL - %s - %s"
+        args = [endpoint, status]
         if response_time:
-            message += f" - {response_time:.2f}s"
+            message += " - %.2fs"
+            args.append(response_time)
         if error:
-            message += f" - ERROR: {error}"
-        self.logger.info(message)
+            message += " - ERROR: %s"
+            args.append(error)
+        self.logger.info(message, *args)
     
     def rate_limit(self, endpoint: str, retry_after: int = None):
         """Log rate limiting events"""
-        message = f"RATE_LIMIT - {endpoint}"
+        message = "RATE_LIMIT - %s"
+        args = [endpoint]
         if retry_after:
-            message += f" - Retry after {retry_after}s"
-        self.logger.warning(message)
+            message += " - Retry after %ss"
+            args.append(retry_after)
+        self.logger.warning(message, *args)
     
     def data_fallback(self, source: str, reason: str):
         """Log when falling back to mock data"""
-        self.logger.info(f"DATA_FALLBACK - {source} - {reason}")
+        self.logger.info("DATA_FALLBACK - %s - %s", source, reason)
     
     def user_action(self, action: str, details: str = None):
         """Log user actions"""
-        message = f"USER_ACTION - {action}"
+        message = "USER_ACTION - %s"
+        args = [action]
         if details:
-            message += f" - {details}"
-        self.logger.info(message)
+            message += " - %s"
+            args.append(details)
+        self.logger.info(message, *args)
     
     def performance(self, operation: str, duration: float):
         """Log performance metrics"""
-        self.logger.info(f"PERFORMANCE - {operation} - {duration:.2f}s")
+        self.logger.info("PERFORMANCE - %s - %.2fs", operation, duration)
 
 # Global logger instance
 logger = HedgeLabLogger() 
\ No newline at end of file
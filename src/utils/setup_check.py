@@ -0,0 +1,87 @@
+import hashlib
+import re
+import subprocess
+import sys
+from importlib import metadata
+from pathlib import Path
+from typing import List
+
+# Shared by run.py and demo.py, and run before the requirements may be installed, so only the standard
+# library is needed here. Try to import packaging to check version pins too, but fall back to presence only.
+try:
+    from packaging.requirements import Requirement
+    PACKAGING_AVAILABLE = True
+except ImportError:
+    PACKAGING_AVAILABLE = False
+
+# Anchored at the checkout, so launching from another directory finds the same files
+PROJECT_ROOT = Path(__file__).resolve().parents[2]
+REQUIREMENTS_FILE = PROJECT_ROOT / "requirements.txt"
+
+# Holds the hash of the requirements.txt the last successful check ran against
+SETUP_SENTINEL = PROJECT_ROOT / ".hedgelab_setup_ok"
+
+def requirements_hash() -> str:
+    """SHA-256 of requirements.txt, so an edited file invalidates the sentinel"""
+    return hashlib.sha256(REQUIREMENTS_FILE.read_bytes()).hexdigest()
+
+def missing_requirements() -> List[str]:
+    """Lines of requirements.txt that are not installed (or installed at a version outside the pin)"""
+    missing = []
+    for line in REQUIREMENTS_FILE.read_text().splitlines():
+        line = line.split('#', 1)[0].strip()
+        if not line:
+            continue
+        
+        requirement = Requirement(line) if PACKAGING_AVAILABLE else None
+        name = requirement.name if requirement else re.split(r'[\s\[<>=!~;]', line, maxsplit=1)[0]
+        try:
+            installed = metadata.version(name)  # Reads package metadata, nothing is imported
+        except metadata.PackageNotFoundError:
+            missing.append(line)
+            continue
+        
+        if requirement and not requirement.specifier.contains(installed, prereleases=True):
+            missing.append(line)
+    return missing
+
+def check_and_setup() -> bool:
+    """Check if setup is needed and run it if necessary"""
+    print("🔧 Checking HedgeLab setup...")
+    
+    # Check that this is a complete checkout
+    if not (PROJECT_ROOT / "setup.py").exists():
+        print(f"❌ setup.py not found in {PROJECT_ROOT}.")
+        return False
+    
+    # Dependencies were already verified against this exact requirements.txt
+    current_hash = requirements_hash()
+    if SETUP_SENTINEL.exists() and SETUP_SENTINEL.read_text().strip() == current_hash:
+        print("✅ All dependencies are installed")
+        return True
+    
+    missing = missing_requirements()
+    if not missing:
+        print("✅ All dependencies are installed")
+        SETUP_SENTINEL.write_text(current_hash)
+        return True
+    
+    print(f"❌ Missing dependency: {', '.join(missing)}")
+    print("🔧 Running setup to install dependencies...")
+    
+    try:
+        result = subprocess.run([sys.executable, "setup.py"], cwd=PROJECT_ROOT,
+                              capture_output=True, text=True, timeout=60)
+        if result.returncode == 0:
+            print("✅ Setup completed successfully")
+            SETUP_SENTINEL.write_text(current_hash)
+            return True
+        else:
+            print(f"❌ Setup failed: {result.stderr}")
+            return False
+    except subprocess.TimeoutExpired:
+        print("❌ Setup timed out")
+        return False
+    except Exception as e:
+        print(f"❌ Setup error: {e}")
+        return False
@@ -10,8 +10,8 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
-# Add src to path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Add the project root to path, so modules import through the src package like the app does
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 class TestResults:
     """Track test results"""
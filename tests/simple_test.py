@@ -7,21 +7,21 @@ Quick test to verify core functionality
 import sys
 import os
 
-# Add src to path
-sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'src'))
+# Add the project root to path, so modules import through the src package like the app does
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 
 def test_imports():
     """Test that all modules can be imported"""
     print("🧪 Testing imports...")
     
     modules = [
-        ('data.market_data', 'Market data module'),
-        ('data.database', 'Database module'),
-        ('ui.components', 'UI components'),
-        ('macro.macro_view', 'Macro view'),
-        ('opportunities.opportunity_detector', 'Opportunity detector'),
-        ('portfolio.portfolio_manager', 'Portfolio manager'),
-        ('portfolio.reports', 'Report generator')
+        ('src.data.market_data', 'Market data module'),
+        ('src.data.database', 'Database module'),
+        ('src.ui.components', 'UI components'),
+        ('src.macro.macro_view', 'Macro view'),
+        ('src.opportunities.opportunity_detector', 'Opportunity detector'),
+        ('src.portfolio.portfolio_manager', 'Portfolio manager'),
+        ('src.portfolio.reports', 'Report generator')
     ]
     
     passed = 0
@@ -43,7 +43,7 @@ def test_market_data():
     print("\n📊 Testing market data...")
     
     try:
-        from data.market_data import market_data
+        from src.data.market_data import market_data
         
         # Test getting stock data
         print("  📈 Testing stock data retrieval...")
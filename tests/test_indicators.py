@@ -0,0 +1,120 @@
+"""
+Indicator kernel checks: the numba recurrences against pandas rolling/ewm references
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.opportunities.indicators import (
+    BATCH_COLUMNS,
+    batch_indicators,
+    bollinger_bands,
+    ema_recurrence,
+    macd_lines,
+    rolling_mean_recurrence,
+    rolling_std_recurrence,
+    wilder_rsi,
+)
+
+@pytest.fixture
+def close() -> pd.Series:
+    """Random-walk closing prices"""
+    rng = np.random.default_rng(7)
+    return pd.Series(100 + np.cumsum(rng.normal(0, 1, 300)))
+
+def assert_same(actual, expected, atol=1e-9):
+    """Equal NaN positions and values within atol"""
+    np.testing.assert_allclose(np.asarray(actual, dtype=float), np.asarray(expected, dtype=float),
+                               rtol=0, atol=atol, equal_nan=True)
+
+def test_rolling_mean_matches_pandas(close):
+    """Running-sum SMA equals pandas rolling mean, including the warm-up NaNs"""
+    assert_same(rolling_mean_recurrence(close.to_numpy(), 20), close.rolling(20).mean())
+
+def test_rolling_mean_skips_gaps_like_pandas(close):
+    """A NaN bar blanks every window that contains it, as in pandas"""
+    gappy = close.copy()
+    gappy.iloc[[0, 50, 51, 120]] = np.nan
+    assert_same(rolling_mean_recurrence(gappy.to_numpy(), 20), gappy.rolling(20).mean())
+    assert_same(rolling_std_recurrence(gappy.to_numpy(), 20), gappy.rolling(20).std(ddof=0))
+
+def test_rolling_std_matches_pandas(close):
+    """Running-sum population std equals pandas rolling std with ddof=0"""
+    assert_same(rolling_std_recurrence(close.to_numpy(), 20), close.rolling(20).std(ddof=0))
+
+def test_rolling_std_flat_window_stays_near_zero():
+    """Cancellation in the running sums never yields a negative variance or NaN"""
+    std = rolling_std_recurrence(np.full(40, 123.45), 20)[19:]
+    assert (std >= 0).all()
+    assert std.max() < 1e-4
+
+def test_ema_matches_pandas(close):
+    """EMA equals pandas ewm(span, min_periods=span, adjust=False)"""
+    expected = close.ewm(span=12, min_periods=12, adjust=False).mean()
+    assert_same(ema_recurrence(close.to_numpy(), 12), expected)
+
+def ewm_mean(series: pd.Series, **kwargs) -> pd.Series:
+    """Recursive (adjust=False) pandas EWM, the form ta computes its averages with"""
+    return series.ewm(adjust=False, **kwargs).mean()
+
+def test_macd_matches_pandas(close):
+    """MACD, signal and histogram equal the 12/26/9 EMA construction ta.trend.MACD uses"""
+    expected_line = ewm_mean(close, span=12, min_periods=12) - ewm_mean(close, span=26, min_periods=26)
+    expected_signal = ewm_mean(expected_line, span=9, min_periods=9)
+    line, signal, hist = macd_lines(close.to_numpy())
+    assert_same(line, expected_line)
+    assert_same(signal, expected_signal)
+    assert_same(hist, expected_line - expected_signal)
+
+def test_bollinger_matches_pandas(close):
+    """Bands equal a 20-bar rolling mean plus/minus two population standard deviations"""
+    expected_middle = close.rolling(20).mean()
+    expected_width = 2 * close.rolling(20).std(ddof=0)
+    middle, upper, lower = bollinger_bands(close.to_numpy())
+    assert_same(middle, expected_middle)
+    assert_same(upper, expected_middle + expected_width)
+    assert_same(lower, expected_middle - expected_width)
+
+def test_wilder_rsi_matches_pandas(close):
+    """Wilder RSI equals gains and losses smoothed with ewm(alpha=1/14), as ta.momentum.RSIIndicator does"""
+    change = close.diff().fillna(0)
+    avg_gain = ewm_mean(change.clip(lower=0), alpha=1 / 14, min_periods=14)
+    avg_loss = ewm_mean(-change.clip(upper=0), alpha=1 / 14, min_periods=14)
+    assert_same(wilder_rsi(close.to_numpy(), 14), 100 - 100 / (1 + avg_gain / avg_loss))
+
+def test_wilder_rsi_all_gains_is_100():
+    """No losses in the window reads as RSI 100 rather than dividing by zero"""
+    rsi = wilder_rsi(np.arange(1.0, 31.0), 14)
+    assert np.isnan(rsi[:13]).all()
+    assert (rsi[13:] == 100).all()
+
+def test_batch_matches_single_symbol_kernels(close):
+    """Every row of the batched output equals the per-symbol kernel for that column"""
+    rng = np.random.default_rng(11)
+    closes = np.vstack([close.to_numpy(), close.to_numpy()[::-1]])
+    volumes = rng.uniform(1e5, 1e6, closes.shape)
+    out = batch_indicators(closes, volumes)
+
+    for row in range(closes.shape[0]):
+        line, signal, hist = macd_lines(closes[row])
+        middle, upper, lower = bollinger_bands(closes[row])
+        expected = {
+            'MA20': rolling_mean_recurrence(closes[row], 20),
+            'MA50': rolling_mean_recurrence(closes[row], 50),
+            'RSI': wilder_rsi(closes[row], 14),
+            'MACD': line,
+            'MACD_signal': signal,
+            'MACD_hist': hist,
+            'BB_upper': upper,
+            'BB_lower': lower,
+            'BB_middle': middle,
+            'Volume_SMA': rolling_mean_recurrence(volumes[row], 20),
+        }
+        for index, name in enumerate(BATCH_COLUMNS):
+            assert_same(out[index, row], expected[name], atol=0)
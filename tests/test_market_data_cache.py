@@ -0,0 +1,104 @@
+"""
+Market indices cache checks: fresh hits, stale-while-revalidate and the blocking fallback
+"""
+
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data import market_data as md
+
+CACHED = {'S&P 500': {'value': 5000.0, 'change': 0.5}}
+FETCHED = {'S&P 500': {'value': 5100.0, 'change': 2.0}}
+
+@pytest.fixture
+def provider(monkeypatch):
+    """Provider with an empty memory cache, no disk cache and a recording fetch"""
+    monkeypatch.setattr(md, '_indices_history', {})
+    monkeypatch.setattr(md, 'DISK_CACHE_ENABLED', False)
+
+    provider = md.MarketDataProvider()
+    provider.fetches = []
+    provider.reports = []
+    provider.fetched = threading.Event()
+
+    def fake_fetch(cache_key, report=True):
+        provider.fetches.append(threading.current_thread() is threading.main_thread())
+        provider.reports.append(report)
+        md._indices_history[cache_key] = (time.time(), FETCHED)
+        provider.fetched.set()
+        return FETCHED
+
+    monkeypatch.setattr(provider, '_fetch_market_indices', fake_fetch)
+    return provider
+
+def cache_with_age(minutes: float):
+    """Seed the memory cache with values fetched the given number of minutes ago"""
+    key = tuple(md.MARKET_INDICES.values())
+    md._indices_history[key] = (time.time() - minutes * 60, CACHED)
+
+def test_empty_cache_fetches_now(provider):
+    """With nothing cached the call blocks on a fetch"""
+    assert provider.get_market_indices() == FETCHED
+    assert provider.fetches == [True]
+
+def test_fresh_cache_is_served_without_fetching(provider):
+    """Values younger than cache_duration come straight from the cache"""
+    cache_with_age(provider.cache_duration / 2)
+
+    assert provider.get_market_indices() == CACHED
+    assert provider.fetches == []
+
+def test_stale_cache_is_served_and_refreshed_in_background(provider):
+    """Stale values are returned at once while a background thread refetches them"""
+    cache_with_age(provider.cache_duration + 1)
+
+    assert provider.get_market_indices() == CACHED
+    assert provider.fetched.wait(5)
+    assert provider.fetches == [False]
+    assert provider.reports == [False]  # The refresh thread has no page to report to
+
+    # The refresh lands in the cache for the next caller
+    assert provider.get_market_indices() == FETCHED
+
+def test_refresh_already_running_is_not_repeated(provider):
+    """A stale hit while a refresh holds the lock starts no second refresh"""
+    cache_with_age(provider.cache_duration + 1)
+
+    with md._indices_refresh_lock:
+        assert provider.get_market_indices() == CACHED
+    assert provider.fetches == []
+
+def test_too_stale_cache_falls_back_to_blocking_fetch(provider):
+    """Values older than stale_cache_duration are not served; the call fetches on its own thread"""
+    cache_with_age(provider.stale_cache_duration + 1)
+
+    assert provider.get_market_indices() == FETCHED
+    assert provider.fetches == [True]
+
+def test_quiet_fetch_failure_only_logs(monkeypatch):
+    """With report=False a failed fetch writes nothing to the page and returns no indices"""
+    monkeypatch.setattr(md, '_indices_history', {})
+    monkeypatch.setattr(md, 'DISK_CACHE_ENABLED', False)
+    page_messages = []
+    monkeypatch.setattr(md.st, 'warning', page_messages.append)
+    monkeypatch.setattr(md.st, 'error', page_messages.append)
+
+    provider = md.MarketDataProvider()
+    provider.rate_limit_delay = 0
+
+    def failing_download(symbols, period="2d"):
+        raise RuntimeError("429 Too Many Requests")
+
+    monkeypatch.setattr(provider, '_download_closes', failing_download)
+
+    assert provider._fetch_market_indices(tuple(md.MARKET_INDICES.values()), report=False) == {}
+    assert page_messages == []
+
+    provider._fetch_market_indices(tuple(md.MARKET_INDICES.values()))
+    assert page_messages
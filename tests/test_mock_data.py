@@ -0,0 +1,50 @@
+"""
+Mock provider checks: memoized and static payloads are handed out as copies
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.data.mock_data import MockMarketDataProvider
+
+def test_stock_data_edits_do_not_leak_between_calls():
+    """Editing one returned frame leaves the next call's frame untouched"""
+    provider = MockMarketDataProvider()
+    first = provider.get_stock_data('AAPL', '3mo')
+    expected = first['Close'].copy()
+
+    first.loc[:, 'Close'] = -1.0
+
+    second = provider.get_stock_data('AAPL', '3mo')
+    assert second['Close'].equals(expected)
+    assert list(second.columns[:2]) == ['Date', 'Open']
+
+def test_stock_info_edits_do_not_leak_between_calls():
+    """Editing one returned info dict leaves the next call's dict untouched"""
+    provider = MockMarketDataProvider()
+    info = provider.get_stock_info('MSFT')
+    pe_ratio = info['pe_ratio']
+
+    info['pe_ratio'] = 0
+
+    assert provider.get_stock_info('MSFT')['pe_ratio'] == pe_ratio
+
+def test_yield_curve_is_not_frozen():
+    """The curve noise is drawn on every call"""
+    provider = MockMarketDataProvider()
+    assert not provider.get_yield_curve()['rate'].equals(provider.get_yield_curve()['rate'])
+
+def test_static_payload_edits_do_not_leak_between_calls():
+    """Editing nested values of the static payloads leaves the module constants untouched"""
+    provider = MockMarketDataProvider()
+    provider.get_market_indices()['VIX']['value'] = 0
+    provider.get_treasury_rates()['10Y']['value'] = 0
+    provider.get_commodities()['Gold']['value'] = 0
+    provider.get_financial_news(1)[0]['title'] = ''
+
+    assert provider.get_market_indices()['VIX']['value'] == 18.5
+    assert provider.get_treasury_rates()['10Y']['value'] == 4.85
+    assert provider.get_commodities()['Gold']['value'] == 1950.0
+    assert provider.get_financial_news(1)[0]['title'] == 'Federal Reserve Signals Potential Rate Cut'
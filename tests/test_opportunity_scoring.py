@@ -0,0 +1,90 @@
+"""
+Opportunity scoring checks: the binned fundamental score against the original per-metric rules
+"""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.opportunities.opportunity_detector import fundamental_scores
+
+def branch_score(stock_info: dict) -> float:
+    """Reference: the if/elif scoring fundamental_scores replaced"""
+    score = 0
+
+    pe_ratio = stock_info.get('pe_ratio', 0)
+    if pe_ratio and 5 <= pe_ratio <= 20:
+        score += 20
+    elif pe_ratio and pe_ratio < 30:
+        score += 10
+
+    profit_margin = stock_info.get('profit_margins', 0)
+    if profit_margin and profit_margin > 0.15:
+        score += 20
+    elif profit_margin and profit_margin > 0.05:
+        score += 10
+
+    revenue_growth = stock_info.get('revenue_growth', 0)
+    if revenue_growth and revenue_growth > 0.15:
+        score += 20
+    elif revenue_growth and revenue_growth > 0.05:
+        score += 10
+
+    pb_ratio = stock_info.get('price_to_book', 0)
+    if pb_ratio and pb_ratio < 1.5:
+        score += 15
+    elif pb_ratio and pb_ratio < 3:
+        score += 8
+
+    div_yield = stock_info.get('dividend_yield', 0)
+    if div_yield and div_yield > 0.02:
+        score += 10
+    elif div_yield and div_yield > 0:
+        score += 5
+
+    beta = stock_info.get('beta', 1)
+    if beta and 0.5 <= beta <= 1.2:
+        score += 15
+    elif beta and beta <= 1.5:
+        score += 8
+
+    return score
+
+@pytest.mark.parametrize("stock_info, expected", [
+    ({}, 15),  # Only the beta default scores
+    ({'pe_ratio': 5, 'profit_margins': 0.2, 'revenue_growth': 0.2, 'price_to_book': 1.0,
+      'dividend_yield': 0.03, 'beta': 1.0}, 100),
+    # Values on the bin edges
+    ({'pe_ratio': 20, 'profit_margins': 0.15, 'revenue_growth': 0.05, 'price_to_book': 1.5,
+      'dividend_yield': 0.02, 'beta': 1.2}, 20 + 10 + 0 + 8 + 5 + 15),
+    ({'pe_ratio': 30, 'price_to_book': 3, 'beta': 1.5}, 0 + 0 + 8),
+    ({'pe_ratio': 4.99, 'beta': 0.5}, 10 + 15),
+    # Missing values: None and NaN score nothing, like zero
+    ({'pe_ratio': None, 'profit_margins': float('nan'), 'beta': None}, 0),
+    ({'pe_ratio': -12, 'beta': -0.3}, 10 + 8),
+])
+def test_fundamental_score_cases(stock_info, expected):
+    """Hand-computed scores, including edges and missing values"""
+    assert fundamental_scores([stock_info])[0] == expected
+    assert branch_score(stock_info) == expected
+
+def test_fundamental_scores_match_branches_on_random_infos():
+    """Vectorised scores equal the per-metric branches over a wide spread of values"""
+    rng = np.random.default_rng(3)
+    infos = [
+        {
+            'pe_ratio': float(rng.choice([0, rng.uniform(-10, 50), 5, 20, 30])),
+            'profit_margins': float(rng.choice([0, rng.uniform(-0.2, 0.4), 0.05, 0.15])),
+            'revenue_growth': float(rng.choice([0, rng.uniform(-0.2, 0.4), 0.05, 0.15])),
+            'price_to_book': float(rng.choice([0, rng.uniform(0, 6), 1.5, 3])),
+            'dividend_yield': float(rng.choice([0, rng.uniform(0, 0.06), 0.02])),
+            'beta': float(rng.choice([0, rng.uniform(-0.5, 2.5), 0.5, 1.2, 1.5])),
+        }
+        for _ in range(1000)
+    ]
+
+    np.testing.assert_array_equal(fundamental_scores(infos), [branch_score(info) for info in infos])
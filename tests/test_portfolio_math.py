@@ -0,0 +1,94 @@
+"""
+Portfolio math checks: positions rebuilt from a trade ledger
+"""
+
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.portfolio.portfolio_manager import PortfolioManager, reduce_trades
+
+def loop_positions(trades: pd.DataFrame) -> dict:
+    """Reference: the per-row loop reduce_trades replaced, with average cost kept through sells"""
+    positions = {}
+    for _, trade in trades.iterrows():
+        quantity, avg_cost = positions.get(trade['symbol'], (0, 0.0))
+        signed = trade['quantity'] if trade['side'] == 'BUY' else -trade['quantity']
+        if signed == 0:
+            continue
+        
+        new_quantity = quantity + signed
+        if quantity == 0 or (quantity > 0) == (signed > 0):
+            avg_cost = (quantity * avg_cost + signed * trade['price']) / new_quantity
+        elif new_quantity == 0:
+            avg_cost = 0.0
+        elif (new_quantity > 0) != (quantity > 0):
+            avg_cost = trade['price']
+        positions[trade['symbol']] = (new_quantity, avg_cost)
+    return positions
+
+def kernel_positions(trades: pd.DataFrame) -> dict:
+    """Positions from the jitted reducer, keyed by symbol"""
+    symbol_ids, symbols = pd.factorize(trades['symbol'])
+    quantity = trades['quantity'].to_numpy(dtype=float)
+    signed = np.where(trades['side'].to_numpy() == 'BUY', quantity, -quantity)
+    net, avg_cost = reduce_trades(symbol_ids, signed, trades['price'].to_numpy(dtype=float), len(symbols))
+    return {symbol: (net[i], avg_cost[i]) for i, symbol in enumerate(symbols)}
+
+def ledger(rows) -> pd.DataFrame:
+    """Trade ledger from (symbol, side, quantity, price) rows"""
+    return pd.DataFrame(rows, columns=['symbol', 'side', 'quantity', 'price'])
+
+@pytest.mark.parametrize("name, rows, expected", [
+    ("buy", [('A', 'BUY', 10, 100.0), ('A', 'BUY', 10, 120.0)], (20, 110.0)),
+    ("partial sell", [('A', 'BUY', 10, 100.0), ('A', 'SELL', 4, 150.0)], (6, 100.0)),
+    ("flip through zero", [('A', 'BUY', 10, 10.0), ('A', 'SELL', 14, 20.0)], (-4, 20.0)),
+    ("full close", [('A', 'BUY', 10, 10.0), ('A', 'SELL', 10, 20.0)], (0, 0.0)),
+    ("zero quantity", [('A', 'BUY', 0, 10.0), ('A', 'BUY', 5, 20.0), ('A', 'SELL', 0, 30.0)], (5, 20.0)),
+])
+def test_reduce_trades_cases(name, rows, expected):
+    """Kernel matches the loop and the hand-worked result"""
+    trades = ledger(rows)
+    assert kernel_positions(trades)['A'] == pytest.approx(expected)
+    assert kernel_positions(trades)['A'] == pytest.approx(loop_positions(trades).get('A', (0, 0.0)))
+
+def test_reduce_trades_random_ledger():
+    """Kernel matches the loop on a mixed multi-symbol ledger"""
+    rng = np.random.default_rng(7)
+    n = 500
+    trades = pd.DataFrame({'symbol': rng.choice(['AAPL', 'MSFT', 'TSLA'], n), 'side': rng.choice(['BUY', 'SELL'], n),
+                           'quantity': rng.integers(0, 20, n), 'price': rng.uniform(10, 200, n).round(2)})
+    
+    expected = loop_positions(trades)
+    for symbol, (quantity, avg_cost) in kernel_positions(trades).items():
+        assert quantity == expected[symbol][0]
+        assert avg_cost == pytest.approx(expected[symbol][1])
+
+class QuoteProvider:
+    """Market provider stand-in with quotes for some symbols only"""
+    def __init__(self, prices: dict):
+        self.prices = prices
+    
+    def get_latest_prices(self, symbols):
+        return pd.Series(self.prices, dtype=float).reindex(symbols)
+
+def test_unpriced_positions_are_left_out_of_totals():
+    """A missing quote leaves the position unvalued instead of pricing it at zero"""
+    manager = PortfolioManager.__new__(PortfolioManager)  # No database needed to value positions
+    manager.market_provider = QuoteProvider({'AAPL': 200.0})
+    positions = pd.DataFrame({'symbol': ['AAPL', 'NOQUOTE'], 'quantity': [10, 5], 'avg_cost': [150.0, 20.0]})
+    
+    valued = manager._value_positions(positions).set_index('symbol')
+    assert valued.loc['AAPL', 'pnl'] == pytest.approx(500.0)
+    assert np.isnan(valued.loc['NOQUOTE', 'current_price'])
+    assert np.isnan(valued.loc['NOQUOTE', 'pnl'])
+    
+    totals = manager._calculate_portfolio_value(positions)
+    assert totals['total_value'] == pytest.approx(2000.0)
+    assert totals['total_cost'] == pytest.approx(1500.0)
+    assert totals['unpriced'] == ['NOQUOTE']
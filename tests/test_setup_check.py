@@ -0,0 +1,44 @@
+"""
+Setup check: the sentinel is tied to the contents of requirements.txt
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+
+from src.utils import setup_check
+
+def test_sentinel_is_reused_until_requirements_change(tmp_path, monkeypatch):
+    """A matching sentinel skips the dependency scan; an edited requirements.txt forces it again"""
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text("pandas>=2.1.0\n")
+    (tmp_path / "setup.py").write_text("")
+    monkeypatch.setattr(setup_check, 'PROJECT_ROOT', tmp_path)
+    monkeypatch.setattr(setup_check, 'REQUIREMENTS_FILE', requirements)
+    monkeypatch.setattr(setup_check, 'SETUP_SENTINEL', tmp_path / ".hedgelab_setup_ok")
+    
+    scans = []
+    monkeypatch.setattr(setup_check, 'missing_requirements', lambda: scans.append(1) or [])
+    
+    assert setup_check.check_and_setup()
+    assert setup_check.check_and_setup()
+    assert len(scans) == 1
+    assert setup_check.SETUP_SENTINEL.read_text() == setup_check.requirements_hash()
+    
+    requirements.write_text("pandas>=2.1.0\nnumba>=0.58.0\n")
+    assert setup_check.check_and_setup()
+    assert len(scans) == 2
+
+def test_missing_requirements_reports_uninstalled_and_outdated(tmp_path, monkeypatch):
+    """Absent distributions and installed versions outside the pin are both reported"""
+    requirements = tmp_path / "requirements.txt"
+    requirements.write_text("# comment\npandas>=2.1.0\nno-such-distribution-hedgelab>=1.0\n"
+                            "numpy<1.0  # far below any current release\n")
+    monkeypatch.setattr(setup_check, 'REQUIREMENTS_FILE', requirements)
+    
+    missing = setup_check.missing_requirements()
+    assert 'no-such-distribution-hedgelab>=1.0' in missing
+    assert 'pandas>=2.1.0' not in missing
+    if setup_check.PACKAGING_AVAILABLE:
+        assert 'numpy<1.0' in missing